@@ -0,0 +1,41 @@
+"""Application settings."""
+from typing import Optional
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Backend settings, read from ``BACHTRACK_*`` environment variables."""
+    model_config = SettingsConfigDict(env_prefix="BACHTRACK_")
+
+    resolver_path: Optional[str] = Field(None, description="JSON lines file persisting freetext-to-work-ID mappings")
+    resolver_min_observations: int = Field(3, description="Agreeing freetext searches needed before it is mapped to a work ID", ge=1)
+    resolver_ttl: float = Field(7 * 24 * 60 * 60, description="Seconds a freetext-to-work-ID mapping is used before it is re-confirmed", gt=0)
+    search_cache_ttl: float = Field(15 * 60, description="Seconds a search result stays cached", ge=0)
+    detail_cache_ttl: float = Field(24 * 60 * 60, description="Seconds a parsed event detail page stays cached", ge=0)
+    parse_workers: int = Field(0, description="Worker processes for parsing search pages (0 parses in-process)", ge=0)
+    incremental_parse: bool = Field(False, description="Parse search pages listing by listing while they download")
+    upstream_max_timeout: float = Field(10, description="Upper bound of the adaptive upstream timeout, in seconds", gt=0)
+    hedging: bool = Field(False, description="Send a duplicate upstream request when a fetch passes its p95 latency")
+    hedge_budget: float = Field(0.05, description="Maximum hedged requests as a fraction of all upstream requests", ge=0, le=1)
+    changelog_size: int = Field(10000, description="Number of search result changes kept for /changes", ge=1)
+    changelog_queries: int = Field(4096, description="Number of queries whose last crawl is kept to diff the next one against", ge=1)
+    watch_refresh_interval: float = Field(60, description="Seconds between refreshes of a watched query", gt=0)
+    watch_max_subscribers: int = Field(1000, description="Maximum concurrent /watch streams per worker", ge=1)
+    watch_queue_size: int = Field(100, description="Changes buffered per /watch stream before it is asked to resync", ge=1)
+    admission_max_concurrent: int = Field(16, description="Upstream-bound requests processed at once", ge=1)
+    admission_max_per_client: int = Field(4, description="Upstream-bound requests one client may have in flight", ge=1)
+    admission_queue_size: int = Field(64, description="Requests allowed to wait for an upstream slot", ge=0)
+    trusted_proxies: Optional[str] = Field(None, description="Comma-separated proxy addresses whose X-Forwarded-For is trusted ('*' trusts any)")
+    admission_queue_timeout: float = Field(5, description="Seconds a request may wait for an upstream slot", gt=0)
+    snapshot_path: Optional[str] = Field(None, description="File the caches are snapshotted to and warmed from on startup")
+    snapshot_interval: float = Field(300, description="Seconds between periodic cache snapshots", gt=0)
+    admin_token: Optional[str] = Field(None, description="Bearer token for /admin endpoints (unset disables them)")
+    diagnostics_size: int = Field(500, description="Entries kept in the diagnostic log served at /admin/diagnostics", ge=1)
+    slow_fetch_threshold: float = Field(2.0, description="Seconds after which an upstream fetch is logged as slow", ge=0)
+    slow_parse_threshold: float = Field(0.5, description="Seconds after which parsing a page is logged as slow", ge=0)
+    gzip_minimum_size: int = Field(1024, description="Smallest response body, in bytes, that gets gzip-compressed", ge=0)
+    venue_cache_ttl: float = Field(30 * 24 * 60 * 60, description="Seconds a venue address stays cached", ge=0)
+
+
+settings = Settings()
@@ -1,7 +1,49 @@
 """FastAPI application factory."""
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import asyncio
+import logging
+from typing import Optional
+import secrets
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from backend.routes.events import router as events_router
+from backend.config import settings
+from backend.middleware import ETagMiddleware, StreamAwareGZipMiddleware
+from backend.routes.events import admission, router as events_router, service
+from scraper.snapshot import load_snapshot, save_snapshot
+
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the caches from the last snapshot, snapshot them periodically and on shutdown."""
+    if not settings.snapshot_path:
+        yield
+        return
+    
+    await run_in_threadpool(load_snapshot, service.scraper, settings.snapshot_path)
+    
+    async def snapshot_periodically():
+        while True:
+            await asyncio.sleep(settings.snapshot_interval)
+            await _save_snapshot()
+    
+    task = asyncio.create_task(snapshot_periodically())
+    try:
+        yield
+    finally:
+        task.cancel()
+        await _save_snapshot()
+
+
+async def _save_snapshot() -> None:
+    """Snapshot the caches, logging rather than raising when the file can't be written."""
+    try:
+        await run_in_threadpool(save_snapshot, service.scraper, settings.snapshot_path)
+    except OSError:
+        logger.exception("Saving the cache snapshot to %s failed", settings.snapshot_path)
 
 
 def create_app() -> FastAPI:
@@ -10,6 +52,7 @@ def create_app() -> FastAPI:
         title="BachtrackAPI",
         description="API to search and retrieve opera events from Bachtrack.com",
         version="0.1.0",
+        lifespan=lifespan,
     )
     
     # Add CORS middleware
@@ -19,6 +62,15 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "X-Total-Count", "X-Next-Cursor"],
+    )
+    
+    # ETags are computed on the uncompressed body; gzip wraps everything
+    app.add_middleware(ETagMiddleware)
+    app.add_middleware(
+        StreamAwareGZipMiddleware,
+        minimum_size=settings.gzip_minimum_size,
+        exclude_paths=["/api/v1/events/watch"],
     )
     
     # Include routers
@@ -29,6 +81,32 @@ def create_app() -> FastAPI:
     async def health_check():
         return {"status": "ok"}
     
+    # Upstream latency, timeout and hedging metrics
+    @app.get("/metrics")
+    async def metrics():
+        return {"upstream": service.scraper.fetcher.metrics(), "admission": admission.stats()}
+    
+    # Slow fetches and parses, and samples of listings and dates that failed to parse;
+    # only served when BACHTRACK_ADMIN_TOKEN is set, to requests bearing that token
+    @app.get("/admin/diagnostics", include_in_schema=False)
+    async def diagnostics(
+        kind: Optional[str] = Query(None, description="Only entries of this kind"),
+        limit: int = Query(100, ge=1, le=1000, description="Maximum number of entries"),
+        authorization: Optional[str] = Header(None),
+    ):
+        if not settings.admin_token:
+            raise HTTPException(status_code=404, detail="Not Found")
+        if not secrets.compare_digest((authorization or "").encode(), f"Bearer {settings.admin_token}".encode()):
+            raise HTTPException(status_code=401, detail="Invalid admin token", headers={"WWW-Authenticate": "Bearer"})
+        log = service.scraper.diagnostics
+        if kind is not None and kind not in log.KINDS:
+            raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(log.KINDS)}")
+        return {
+            "counts": log.counts(),
+            "thresholds": {"slow_fetch": log.slow_fetch, "slow_parse": log.slow_parse},
+            "entries": log.entries(kind=kind, limit=limit),
+        }
+    
     return app
 
 
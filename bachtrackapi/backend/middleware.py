@@ -0,0 +1,96 @@
+"""HTTP middleware for the FastAPI application."""
+import hashlib
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import Response
+
+
+class ETagMiddleware(BaseHTTPMiddleware):
+    """
+    Add strong ETags to successful GET responses and answer ``If-None-Match`` with 304.
+
+    The ETag is a hash of the response body, so identical result sets get the
+    same validator no matter when they were scraped. The compression
+    middleware adds the content-coding to it (``"<hash>-gzip"``), and a 304
+    echoes whichever variant the client sent.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if request.method != "GET" or response.status_code != 200:
+            return response
+        if response.headers.get("content-type", "").startswith("text/event-stream"):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = f'"{hashlib.sha256(body).hexdigest()}"'
+        headers = dict(response.headers)
+        headers["etag"] = etag
+
+        matched = _matching_etag(request.headers.get("if-none-match"), etag)
+        if matched:
+            headers["etag"] = matched
+            headers.pop("content-length", None)
+            headers.pop("content-type", None)
+            return Response(status_code=304, headers=headers)
+
+        return Response(
+            content=body,
+            status_code=response.status_code,
+            headers=headers,
+            media_type=response.media_type,
+            background=response.background,
+        )
+
+
+class StreamAwareGZipMiddleware(GZipMiddleware):
+    """
+    GZip middleware that leaves server-sent event streams uncompressed, so events are not held back.
+
+    A compressed response is a different representation from the
+    uncompressed one, so its strong ETag gets the content-coding appended.
+    """
+
+    def __init__(self, app, minimum_size: int = 500, exclude_paths=()):
+        super().__init__(app, minimum_size=minimum_size)
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_coded_etag(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if headers.get("content-encoding") == "gzip" and "etag" in headers:
+                    headers["etag"] = _coded_etag(headers["etag"], "gzip")
+            await send(message)
+
+        await super().__call__(scope, receive, send_with_coded_etag)
+
+
+def _coded_etag(etag: str, coding: str) -> str:
+    """Append a content-coding to an ETag: ``"abc"`` becomes ``"abc-gzip"``."""
+    return f'{etag[:-1]}-{coding}"' if etag.endswith('"') else etag
+
+
+def _matching_etag(if_none_match: str, etag: str) -> str:
+    """
+    Check an If-None-Match header value against an ETag and its gzip variant.
+
+    Returns:
+        The validator to send back with a 304, or an empty string if nothing matches
+    """
+    if not if_none_match:
+        return ""
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    if "*" in candidates:
+        return etag
+    for candidate in candidates:
+        opaque = candidate[2:] if candidate.startswith("W/") else candidate
+        if opaque in (etag, _coded_etag(etag, "gzip")):
+            return opaque
+    return ""
@@ -1,7 +1,7 @@
 """Data models for opera events API."""
 from pydantic import BaseModel, Field, HttpUrl
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, List, Literal, Optional, Union
 
 
 class OperaEvent(BaseModel):
@@ -49,11 +49,28 @@ class SearchRequest(BaseModel):
         }
 
 
+class BatchSearchRequest(BaseModel):
+    """Batch search request: several work IDs and/or search terms merged into one result set."""
+    queries: List[Union[Annotated[int, Field(gt=0)], Annotated[str, Field(min_length=1, max_length=200)]]] = Field(
+        ..., description="Work IDs or freetext search terms", min_length=1, max_length=50
+    )
+    distinct: Literal["performances", "productions"] = Field(
+        "performances",
+        description="Return each performance once, or only the first performance of each production",
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {"queries": [12285, "gianni schicchi", "Il trittico"], "distinct": "productions"}
+        }
+
+
 class SearchResponse(BaseModel):
     """Search response with results."""
     query: str = Field(..., description="Search query (work_id or search term)")
     total_results: int = Field(..., description="Number of results found")
-    results: list[OperaEvent] = Field(..., description="List of opera events")
+    results: list[OperaEvent] = Field(..., description="List of opera events (only the requested fields when `fields` is used)")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, absent on the last page")
     
     class Config:
         json_schema_extra = {
@@ -71,3 +88,18 @@ class SearchResponse(BaseModel):
                 ]
             }
         }
+
+
+class EventChange(BaseModel):
+    """A performance added, removed or rescheduled between two crawls of a query."""
+    seq: int = Field(..., description="Position of the change in the change feed")
+    query: str = Field(..., description="Canonical search URL the change was observed on")
+    change: Literal["added", "removed", "rescheduled"] = Field(..., description="Kind of change")
+    event: OperaEvent = Field(..., description="The event (with its new date when rescheduled)")
+    previous_date: Optional[datetime] = Field(None, description="Date before rescheduling")
+
+
+class ChangesResponse(BaseModel):
+    """Changes since a change token."""
+    token: str = Field(..., description="Pass as `since` on the next request")
+    changes: List[EventChange] = Field(..., description="Changes in the order they were observed")
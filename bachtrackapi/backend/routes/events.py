@@ -1,20 +1,48 @@
 """Event search endpoints."""
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Dict, Any
-from backend.models.event import SearchRequest, SearchResponse, OperaEvent
-from backend.services.opera_service import OperaEventService
-from scraper.scraper import BachtrackScraper
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Dict, Any, Optional
+import asyncio
+import json
+from backend.config import settings
+from backend.models.event import BatchSearchRequest, ChangesResponse, EventChange, SearchRequest, SearchResponse, OperaEvent
+from backend.services.admission import AdmissionController, AdmissionRejected
+from backend.services.changes import ChangelogExpiredError
+from backend.services.opera_service import CursorExpiredError, OperaEventService
+from backend.services.watch import WatchHub, WatchLimitError
 
 
 router = APIRouter(prefix="/api/v1/events", tags=["events"])
 service = OperaEventService()
-scraper = BachtrackScraper()
+watch_hub = WatchHub(
+    service,
+    refresh_interval=settings.watch_refresh_interval,
+    max_subscribers=settings.watch_max_subscribers,
+    queue_size=settings.watch_queue_size,
+)
+admission = AdmissionController(
+    max_concurrent=settings.admission_max_concurrent,
+    max_per_client=settings.admission_max_per_client,
+    max_queue=settings.admission_queue_size,
+    queue_timeout=settings.admission_queue_timeout,
+)
+
+# Comment line sent on idle streams so proxies keep the connection open
+KEEPALIVE_INTERVAL = 15
 
 
 @router.get("/search", response_model=SearchResponse)
 async def search_operas_get(
+    request: Request,
+    response: Response,
     work_id: int = Query(None, gt=0, description="Bachtrack work ID"),
-    q: str = Query(None, min_length=1, max_length=200, description="Freetext search term")
+    q: str = Query(None, min_length=1, max_length=200, description="Freetext search term"),
+    limit: int = Query(None, ge=1, le=500, description="Maximum number of events to return"),
+    cursor: str = Query(None, description="Cursor from a previous response's next_cursor"),
+    sort: str = Query(None, pattern="^-?(date|city)$", description="Sort by date or city (prefix with - for descending)"),
+    fields: str = Query(None, description="Comma-separated event fields to return, e.g. title,date"),
 ):
     """
     Search for opera events by work ID or freetext.
@@ -22,6 +50,10 @@ async def search_operas_get(
     Args:
         work_id: Bachtrack work ID (e.g., 12285 for Gianni Schicchi)
         q: Freetext search term (e.g., "Il barbiere di Siviglia")
+        limit: Page size
+        cursor: Opaque pagination cursor
+        sort: Sort order
+        fields: Field projection
         
     Returns:
         SearchResponse with matching opera events
@@ -36,19 +68,35 @@ async def search_operas_get(
     
     search_input = work_id if work_id else q
     
+    projection = _parse_fields(fields)
     try:
-        results = service.search_operas(search_input)
-        return SearchResponse(
-            query=str(search_input),
-            total_results=len(results),
-            results=results
+        results, total, next_cursor = await _upstream(
+            request, [search_input], service.search_page, search_input, limit, cursor, sort, projection
         )
+    except CursorExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except RuntimeError as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    body = {
+        "query": str(search_input),
+        "total_results": total,
+        "results": results,
+        "next_cursor": next_cursor,
+    }
+    if projection:
+        # Partial events don't fit OperaEvent; serialize the page as-is
+        response = JSONResponse(jsonable_encoder(body))
+        _set_cache_control(response, search_input)
+        return response
+    _set_cache_control(response, search_input)
+    return SearchResponse(**body)
 
 
 @router.post("/search", response_model=SearchResponse)
-async def search_operas_post(request: SearchRequest):
+async def search_operas_post(request: SearchRequest, http_request: Request):
     """
     Search for opera events by work ID or freetext (POST method).
     
@@ -67,7 +115,7 @@ async def search_operas_post(request: SearchRequest):
     search_input = request.work_id if request.work_id else request.search_term
     
     try:
-        results = service.search_operas(search_input)
+        results = await _upstream(http_request, [search_input], service.search_operas, search_input)
         return SearchResponse(
             query=str(search_input),
             total_results=len(results),
@@ -77,16 +125,134 @@ async def search_operas_post(request: SearchRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/search/batch", response_model=SearchResponse)
+async def search_operas_batch(request: BatchSearchRequest, http_request: Request):
+    """
+    Run several searches and return their merged, deduplicated results.
+    
+    Args:
+        request: BatchSearchRequest with work IDs and/or search terms
+        
+    Returns:
+        SearchResponse with each performance (or production) once
+    """
+    try:
+        results = await _upstream(http_request, request.queries, service.search_many, request.queries, request.distinct)
+        return SearchResponse(
+            query=", ".join(str(query) for query in request.queries),
+            total_results=len(results),
+            results=results
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/changes", response_model=ChangesResponse)
+async def get_changes(
+    since: str = Query(None, description="Token from a previous /changes response"),
+    work_id: int = Query(None, gt=0, description="Only changes for this work ID"),
+    q: str = Query(None, min_length=1, max_length=200, description="Only changes for this search term"),
+):
+    """
+    Get performances added, removed or rescheduled since a change token.
+    
+    Call without `since` to get the current token, then poll with it.
+    
+    Args:
+        since: Change token
+        work_id: Optional work ID filter
+        q: Optional freetext filter
+        
+    Returns:
+        ChangesResponse with the changes and the next token
+    """
+    if work_id and q:
+        raise HTTPException(status_code=400, detail="Provide either work_id or q, not both")
+    
+    try:
+        changes, token = service.get_changes(since, work_id or q)
+    except ChangelogExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ChangesResponse(token=token, changes=changes)
+
+
+@router.get("/watch", response_class=StreamingResponse)
+async def watch_operas(
+    work_id: int = Query(None, gt=0, description="Bachtrack work ID to watch"),
+    q: str = Query(None, min_length=1, max_length=200, description="Search term to watch"),
+):
+    """
+    Stream changes to a query's results as server-sent events.
+    
+    All subscribers of the same query share one background refresh. Each
+    change is sent as an event named after its kind (added, removed,
+    rescheduled) with an EventChange as data. A `resync` event means the
+    client fell too far behind and should re-run the search.
+    
+    Args:
+        work_id: Work ID to watch
+        q: Search term to watch
+        
+    Returns:
+        text/event-stream response
+    """
+    if not work_id and not q:
+        raise HTTPException(status_code=400, detail="Provide either work_id or q parameter")
+    
+    if work_id and q:
+        raise HTTPException(status_code=400, detail="Provide either work_id or q, not both")
+    
+    try:
+        subscription = watch_hub.subscribe(work_id or q)
+    except WatchLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(KEEPALIVE_INTERVAL)})
+    
+    async def stream():
+        try:
+            yield f"event: ready\ndata: {json.dumps({'query': subscription.key})}\n\n"
+            while True:
+                try:
+                    change = await asyncio.wait_for(subscription.queue.get(), timeout=KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if change is None:
+                    yield "event: resync\ndata: {}\n\n"
+                    break
+                data = EventChange(**change).model_dump_json()
+                yield f"id: {change['seq']}\nevent: {change['change']}\ndata: {data}\n\n"
+        finally:
+            watch_hub.unsubscribe(subscription)
+    
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
 @router.get("/get_operas", response_model=List[Dict[str, Any]])
-async def get_operas(q: str = Query(..., min_length=1, max_length=200, description="Search term (work ID or freetext)")):
+async def get_operas(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Search term (work ID or freetext)"),
+    limit: int = Query(None, ge=1, le=500, description="Maximum number of events to return"),
+    cursor: str = Query(None, description="Cursor from a previous response's X-Next-Cursor header"),
+    sort: str = Query(None, pattern="^-?(date|city)$", description="Sort by date or city (prefix with - for descending)"),
+    fields: str = Query(None, description="Comma-separated event fields to return, e.g. title,date"),
+):
     """
     Get opera events directly from scraper.
     
     Args:
         q: Search input - can be a work ID (int) or freetext search term
+        limit: Page size
+        cursor: Opaque pagination cursor
+        sort: Sort order
+        fields: Field projection
         
     Returns:
-        Raw list of opera events from BachtrackScraper
+        Raw list of opera events from BachtrackScraper. The total count and
+        the next page cursor are returned in the X-Total-Count and
+        X-Next-Cursor headers.
         
     Example:
         GET /api/v1/events/get_operas?q=gianni%20schicchi
@@ -99,7 +265,68 @@ async def get_operas(q: str = Query(..., min_length=1, max_length=200, descripti
         except ValueError:
             search_input = q
         
-        results = scraper.search_operas(search_input)
-        return results
+        results, total, next_cursor = await _upstream(
+            request, [search_input], service.search_page, search_input, limit, cursor, sort, _parse_fields(fields)
+        )
+    except HTTPException:
+        raise
+    except CursorExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Scraper error: {str(e)}")
+    
+    _set_cache_control(response, search_input)
+    response.headers["X-Total-Count"] = str(total)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return results
+
+
+async def _upstream(request: Request, search_inputs, func, *args):
+    """
+    Run a search in the threadpool, under admission control unless it is served from cache.
+    
+    Raises:
+        HTTPException: 429 or 503 with Retry-After when the request is shed
+    """
+    if all(service.is_cached(search_input) for search_input in search_inputs):
+        return await run_in_threadpool(func, *args)
+    
+    try:
+        async with admission.admit(_client_key(request)):
+            return await run_in_threadpool(func, *args)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail, headers={"Retry-After": str(e.retry_after)})
+
+
+def _client_key(request: Request) -> str:
+    """
+    Identify the client a request is counted against for per-client limits.
+    
+    X-Forwarded-For is only honoured when the connection comes from a proxy
+    listed in BACHTRACK_TRUSTED_PROXIES; the client is then the nearest hop
+    that is not itself a trusted proxy.
+    """
+    peer = request.client.host if request.client else "unknown"
+    trusted = {proxy.strip() for proxy in (settings.trusted_proxies or "").split(",") if proxy.strip()}
+    if not trusted or ("*" not in trusted and peer not in trusted):
+        return peer
+    hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if "*" in trusted or hop not in trusted:
+            return hop
+    return peer
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated fields parameter."""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()]
+
+
+def _set_cache_control(response: Response, search_input) -> None:
+    """Let clients reuse a search response for as long as the cached result stays fresh."""
+    response.headers["Cache-Control"] = f"public, max-age={service.freshness(search_input)}"
@@ -0,0 +1,85 @@
+"""Admission control for requests that need an upstream fetch."""
+from contextlib import asynccontextmanager
+from typing import Dict
+import asyncio
+import math
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+    
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Cap concurrent upstream-bound requests globally and per client.
+    
+    Requests beyond the global limit wait in a bounded queue for at most
+    queue_timeout seconds. A full queue or an expired wait is answered with
+    503, a client over its own limit with 429; both carry a Retry-After.
+    """
+    
+    def __init__(self, max_concurrent: int = 16, max_per_client: int = 4, max_queue: int = 64, queue_timeout: float = 5.0):
+        """
+        Args:
+            max_concurrent: Upstream-bound requests processed at once
+            max_per_client: Upstream-bound requests one client may have admitted or queued
+            max_queue: Requests allowed to wait for a free slot
+            queue_timeout: Seconds a request may wait before it is shed
+        """
+        self.max_concurrent = max_concurrent
+        self.max_per_client = max_per_client
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = None
+        self._waiting = 0
+        self._per_client: Dict[str, int] = {}
+    
+    @asynccontextmanager
+    async def admit(self, client: str):
+        """
+        Hold an upstream slot for the duration of the block.
+        
+        Args:
+            client: Client identifier (e.g. its IP address)
+            
+        Raises:
+            AdmissionRejected: If the client is over its limit or no slot frees up in time
+        """
+        if self._slots is None:
+            # Created on first use so it binds to the serving event loop
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        
+        if self._per_client.get(client, 0) >= self.max_per_client:
+            raise AdmissionRejected(429, "Too many concurrent requests from this client", retry_after=1)
+        
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            raise AdmissionRejected(503, "Server is overloaded", retry_after=math.ceil(self.queue_timeout))
+        
+        self._per_client[client] = self._per_client.get(client, 0) + 1
+        try:
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise AdmissionRejected(503, "Server is overloaded", retry_after=math.ceil(self.queue_timeout))
+            finally:
+                self._waiting -= 1
+            
+            try:
+                yield
+            finally:
+                self._slots.release()
+        finally:
+            self._per_client[client] -= 1
+            if not self._per_client[client]:
+                del self._per_client[client]
+    
+    def stats(self) -> Dict:
+        """Current number of waiting requests and clients holding or awaiting slots."""
+        return {"waiting": self._waiting, "clients": len(self._per_client)}
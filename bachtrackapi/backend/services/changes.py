@@ -0,0 +1,134 @@
+"""Change feed: differences between successive crawls of the same query."""
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import threading
+
+from scraper.cache import TTLCache
+from scraper.dedup import performance_key, production_key
+
+
+class ChangelogExpiredError(Exception):
+    """Raised when a change token is older than the oldest change still retained."""
+
+
+class ChangeLog:
+    """
+    Bounded log of added, removed and rescheduled performances.
+    
+    Each crawl of a query is compared with the previous crawl of the same
+    query. A production (detail URL) that lost one date and gained another is
+    reported as rescheduled rather than as a removal plus an addition. The
+    first crawl of a query only records a baseline. Baselines are kept for
+    the max_queries most recently crawled queries and for at most
+    baseline_ttl seconds; a query whose baseline was dropped starts over
+    with a new baseline.
+    
+    The log lives in process memory: tokens are sequence numbers of one
+    worker process, restart from zero when it restarts, and are meaningless
+    to other workers. A token from before a restart can silently miss
+    changes, so clients should re-run their search after a restart.
+    """
+    
+    BASELINE_TTL = 24 * 60 * 60
+    
+    def __init__(self, max_changes: int = 10000, max_queries: int = 4096, baseline_ttl: float = BASELINE_TTL):
+        """
+        Args:
+            max_changes: Number of changes retained before the oldest are dropped
+            max_queries: Number of queries whose last crawl is kept as a baseline
+            baseline_ttl: Seconds a baseline is kept after its crawl
+        """
+        self._changes = deque(maxlen=max_changes)
+        self._snapshots = TTLCache(ttl=baseline_ttl, max_entries=max_queries)
+        self._seq = 0
+        self._lock = threading.Lock()
+    
+    def record(self, query: str, events: List[Dict]) -> List[Dict]:
+        """
+        Diff a fresh crawl of query against the previous one and log the changes.
+        
+        Args:
+            query: Canonical query key (the search URL)
+            events: Events returned by the crawl
+            
+        Returns:
+            The change records added to the log
+        """
+        snapshot = {performance_key(event): event for event in events}
+        with self._lock:
+            previous = self._snapshots.get(query)
+            self._snapshots.set(query, snapshot)
+            if previous is None:
+                return []
+            
+            added = [snapshot[key] for key in snapshot.keys() - previous.keys()]
+            removed = [previous[key] for key in previous.keys() - snapshot.keys()]
+            records = []
+            for change, event, previous_date in self._pair_reschedules(added, removed):
+                self._seq += 1
+                record = {
+                    "seq": self._seq,
+                    "query": query,
+                    "change": change,
+                    "event": event,
+                    "previous_date": previous_date,
+                }
+                self._changes.append(record)
+                records.append(record)
+            return records
+    
+    def since(self, token: Optional[str] = None, query: Optional[str] = None) -> Tuple[List[Dict], str]:
+        """
+        Return changes logged after token.
+        
+        Args:
+            token: Token from a previous call (None returns no changes and the current token)
+            query: Only return changes for this canonical query key
+            
+        Returns:
+            Tuple of (change records, token to pass next time)
+            
+        Raises:
+            ValueError: If token is malformed
+            ChangelogExpiredError: If changes after token were already dropped
+        """
+        with self._lock:
+            current = str(self._seq)
+            if token is None:
+                return [], current
+            try:
+                seq = int(token)
+            except ValueError:
+                raise ValueError("Invalid change token")
+            if seq < 0 or seq > self._seq:
+                raise ValueError("Invalid change token")
+            if self._changes and seq + 1 < self._changes[0]["seq"]:
+                raise ChangelogExpiredError("Changes since this token are no longer available; re-run the search")
+            changes = [
+                record for record in self._changes
+                if record["seq"] > seq and (query is None or record["query"] == query)
+            ]
+            return changes, current
+    
+    @staticmethod
+    def _pair_reschedules(added: List[Dict], removed: List[Dict]):
+        """Yield (change, event, previous_date), pairing removed and added dates of the same production."""
+        added_by_production: Dict = {}
+        for event in sorted(added, key=_event_date):
+            added_by_production.setdefault(production_key(event), []).append(event)
+        
+        for event in sorted(removed, key=_event_date):
+            replacements = added_by_production.get(production_key(event))
+            if replacements:
+                yield "rescheduled", replacements.pop(0), event["date"]
+            else:
+                yield "removed", event, None
+        
+        for events in added_by_production.values():
+            for event in events:
+                yield "added", event, None
+
+
+def _event_date(event: Dict) -> datetime:
+    return event["date"]
@@ -1,14 +1,58 @@
 """Service layer for opera events business logic."""
-from typing import List, Union
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import base64
+import hashlib
+import json
+from scraper.dedup import EventIndex
+from scraper.diagnostics import DiagnosticLog
+from scraper.latency import UpstreamFetcher
+from scraper.pool import ParsePool
 from scraper.scraper import BachtrackScraper
+from scraper.resolver import WorkResolver
+from backend.config import settings
+from backend.services.changes import ChangeLog
 from backend.models.event import OperaEvent, OperaEventDetail
 
 
+class CursorExpiredError(Exception):
+    """Raised when a cursor was issued for a result that has since changed."""
+
+
+EVENT_FIELDS = tuple(OperaEvent.model_fields)
+SORT_KEYS = {
+    "date": lambda event: event["date"],
+    "city": lambda event: (event["city"], event["date"]),
+}
+
+
 class OperaEventService:
     """Service for opera event operations."""
     
     def __init__(self):
-        self.scraper = BachtrackScraper()
+        self.scraper = BachtrackScraper(
+            resolver=WorkResolver(
+                settings.resolver_path,
+                min_observations=settings.resolver_min_observations,
+                ttl=settings.resolver_ttl,
+            ),
+            search_cache_ttl=settings.search_cache_ttl,
+            detail_cache_ttl=settings.detail_cache_ttl,
+            venue_cache_ttl=settings.venue_cache_ttl,
+            parse_pool=ParsePool(settings.parse_workers) if settings.parse_workers else None,
+            incremental=settings.incremental_parse,
+            fetcher=UpstreamFetcher(
+                max_timeout=settings.upstream_max_timeout,
+                hedging=settings.hedging,
+                hedge_budget=settings.hedge_budget,
+            ),
+            diagnostics=DiagnosticLog(
+                max_entries=settings.diagnostics_size,
+                slow_fetch=settings.slow_fetch_threshold,
+                slow_parse=settings.slow_parse_threshold,
+            ),
+        )
+        self.changes = ChangeLog(settings.changelog_size, max_queries=settings.changelog_queries)
+        self.scraper.fetch_listeners.append(self.changes.record)
     
     def search_operas(self, search_input: Union[int, str]) -> List[OperaEvent]:
         """
@@ -23,6 +67,155 @@ class OperaEventService:
         events = self.scraper.search_operas(search_input)
         return [OperaEvent(**event) for event in events]
     
+    def search_page(
+        self,
+        search_input: Union[int, str],
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Dict], int, Optional[str]]:
+        """
+        Return one page of a search, optionally sorted and projected.
+        
+        Only the events on the page are copied and only the requested fields
+        are kept, so nothing outside the page is validated or serialized.
+        
+        Args:
+            search_input: Either an integer work ID or a string search term
+            limit: Maximum events on the page (all remaining if None)
+            cursor: Opaque cursor from a previous page's next_cursor
+            sort: "date", "city", "-date" or "-city" (upstream order if None)
+            fields: Event fields to keep (all if None)
+            
+        Returns:
+            Tuple of (page of event dictionaries, total number of events, next cursor or None)
+            
+        Raises:
+            ValueError: If sort, fields or cursor are invalid
+            CursorExpiredError: If the result changed since the cursor was issued
+        """
+        if sort is not None and sort.lstrip("-") not in SORT_KEYS:
+            raise ValueError(f"Invalid sort: {sort}")
+        unknown = set(fields or ()) - set(EVENT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        
+        fingerprint = self._cursor_fingerprint(search_input, sort)
+        if cursor:
+            # Check the cursor is for this query before searching
+            self._decode_cursor(cursor, fingerprint)
+        
+        events = self.scraper.search_operas(search_input)
+        version = self._result_version(events)
+        offset = self._decode_cursor(cursor, fingerprint, version) if cursor else 0
+        if sort is not None:
+            events.sort(key=SORT_KEYS[sort.lstrip("-")], reverse=sort.startswith("-"))
+        
+        end = len(events) if limit is None else min(offset + limit, len(events))
+        page = events[offset:end]
+        if fields:
+            page = [{field: event.get(field) for field in fields} for event in page]
+        
+        next_cursor = self._encode_cursor(end, fingerprint, version) if end < len(events) else None
+        return page, len(events), next_cursor
+    
+    def search_many(self, search_inputs: Iterable[Union[int, str]], distinct: str = "performances") -> List[OperaEvent]:
+        """
+        Run several searches and merge duplicate events across them.
+        
+        Args:
+            search_inputs: Work IDs and/or search terms
+            distinct: "performances" to keep each performance once, or
+                "productions" to keep only the first performance of each production
+            
+        Returns:
+            List of distinct OperaEvent objects, in first-seen order
+        """
+        index = EventIndex()
+        for search_input in search_inputs:
+            index.extend(self.scraper.search_operas(search_input))
+        events = index.productions() if distinct == "productions" else index.performances()
+        return [OperaEvent(**event) for event in events]
+    
+    def is_cached(self, search_input: Union[int, str]) -> bool:
+        """
+        Whether a search can be answered from cache without an upstream fetch.
+        
+        Args:
+            search_input: Either an integer work ID or a string search term
+            
+        Returns:
+            True if a fresh cached result exists
+        """
+        return self.scraper.cache_key(search_input) in self.scraper.search_cache
+    
+    def freshness(self, search_input: Union[int, str]) -> int:
+        """
+        Seconds until the cached result for a search goes stale.
+        
+        Args:
+            search_input: Either an integer work ID or a string search term
+            
+        Returns:
+            Remaining cache lifetime in whole seconds (0 if not cached)
+        """
+        remaining = self.scraper.search_cache.remaining(self.scraper.cache_key(search_input))
+        return int(remaining or 0)
+    
+    def get_changes(self, since: Optional[str] = None, search_input: Optional[Union[int, str]] = None) -> Tuple[List[Dict], str]:
+        """
+        Get search result changes logged after a change token.
+        
+        Args:
+            since: Token returned by a previous call (None to get the current token)
+            search_input: Only return changes for this work ID or search term
+            
+        Returns:
+            Tuple of (change records, token for the next call)
+        """
+        query = self.scraper.cache_key(search_input) if search_input is not None else None
+        return self.changes.since(since, query=query)
+    
+    def _cursor_fingerprint(self, search_input: Union[int, str], sort: Optional[str]) -> str:
+        """Short hash tying a cursor to the query (in canonical form) and sort order it was issued for."""
+        key = self.scraper.cache_key(search_input)
+        return hashlib.sha256(f"{key}|{sort}".encode("utf-8")).hexdigest()[:12]
+    
+    @staticmethod
+    def _result_version(events: List[Dict]) -> str:
+        """Short hash of a result in upstream order, so a refetch that changed it invalidates cursors."""
+        digest = hashlib.sha256()
+        for event in events:
+            digest.update(f"{event['detail_url']}|{event['date'].isoformat()}|{event['city']}|{event['venue']}|{event['title']}\n".encode("utf-8"))
+        return digest.hexdigest()[:12]
+    
+    @staticmethod
+    def _encode_cursor(offset: int, fingerprint: str, version: str) -> str:
+        """Encode a page offset as an opaque cursor."""
+        payload = json.dumps({"o": offset, "f": fingerprint, "v": version}).encode("utf-8")
+        return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+    
+    @staticmethod
+    def _decode_cursor(cursor: str, fingerprint: str, version: Optional[str] = None) -> int:
+        """
+        Decode a cursor, rejecting cursors issued for another query or sort.
+        
+        Raises:
+            ValueError: If the cursor is malformed or for another query or sort
+            CursorExpiredError: If version is given and the cursor was issued for another version of the result
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            offset = int(payload["o"])
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Invalid cursor")
+        if payload.get("f") != fingerprint or offset < 0:
+            raise ValueError("Cursor does not match this query")
+        if version is not None and payload.get("v") != version:
+            raise CursorExpiredError("The results changed since this cursor was issued; start again from the first page")
+        return offset
+    
     def get_event_details(self, detail_url: str) -> dict:
         """
         Get detailed information for an event.
@@ -0,0 +1,137 @@
+"""Push of search result changes to subscribers watching a query."""
+from typing import Dict, Optional, Set, Union
+import asyncio
+import logging
+
+from backend.services.changes import ChangelogExpiredError
+
+
+logger = logging.getLogger(__name__)
+
+
+class WatchLimitError(Exception):
+    """Raised when the worker already serves its maximum number of subscribers."""
+
+
+class Subscription:
+    """One client's bounded queue of change records for a watched query."""
+    
+    def __init__(self, key: str, queue_size: int):
+        self.key = key
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    
+    def offer(self, change: Optional[dict]) -> bool:
+        """
+        Queue a change without blocking the refresher.
+        
+        A subscriber that falls a full queue behind is cut off: its queue is
+        replaced by a single None, telling the stream to ask the client to
+        resync.
+        
+        Returns:
+            False if the subscriber was cut off
+        """
+        try:
+            self.queue.put_nowait(change)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            return False
+
+
+class _Watch:
+    """Shared refresh state of one watched query."""
+    
+    def __init__(self, search_input: Union[int, str], token: str):
+        self.search_input = search_input
+        self.token = token
+        self.subscribers: Set[Subscription] = set()
+        self.task: Optional[asyncio.Task] = None
+
+
+class WatchHub:
+    """
+    Share one background refresh per watched query among all its subscribers.
+    
+    Each watched query is searched every refresh_interval seconds; upstream
+    is only hit when the cached result has expired. New entries in the
+    service's change feed are then pushed to every subscriber.
+    """
+    
+    def __init__(self, service, refresh_interval: float = 60.0, max_subscribers: int = 1000, queue_size: int = 100):
+        """
+        Args:
+            service: OperaEventService used for searches and the change feed
+            refresh_interval: Seconds between refreshes of a watched query
+            max_subscribers: Maximum concurrent subscribers in this worker
+            queue_size: Changes buffered per subscriber before it is cut off
+        """
+        self.service = service
+        self.refresh_interval = refresh_interval
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self._watches: Dict[str, _Watch] = {}
+        self._subscribers = 0
+    
+    def subscribe(self, search_input: Union[int, str]) -> Subscription:
+        """
+        Start watching a query, starting its refresher if it is the first subscriber.
+        
+        Args:
+            search_input: Work ID or search term to watch
+            
+        Returns:
+            Subscription whose queue receives change records
+            
+        Raises:
+            WatchLimitError: If the subscriber limit is reached
+        """
+        if self._subscribers >= self.max_subscribers:
+            raise WatchLimitError("Too many subscribers, try again later")
+        
+        key = self.service.scraper.cache_key(search_input)
+        watch = self._watches.get(key)
+        if watch is None:
+            _, token = self.service.get_changes()
+            watch = self._watches[key] = _Watch(search_input, token)
+            watch.task = asyncio.get_running_loop().create_task(self._refresh(watch))
+        
+        subscription = Subscription(key, self.queue_size)
+        watch.subscribers.add(subscription)
+        self._subscribers += 1
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop a subscription, and the refresher once nobody watches its query."""
+        watch = self._watches.get(subscription.key)
+        if watch is None or subscription not in watch.subscribers:
+            return
+        watch.subscribers.discard(subscription)
+        self._subscribers -= 1
+        if not watch.subscribers:
+            watch.task.cancel()
+            del self._watches[subscription.key]
+    
+    async def _refresh(self, watch: _Watch) -> None:
+        """Refresh a watched query forever, pushing new changes to its subscribers."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, self.service.search_operas, watch.search_input)
+                changes, watch.token = self.service.get_changes(watch.token, watch.search_input)
+            except ChangelogExpiredError:
+                changes, watch.token = self.service.get_changes()
+            except RuntimeError:
+                # Upstream failure; try again on the next refresh
+                changes = []
+            except Exception:
+                # Anything else must not end the refresher and leave subscribers waiting forever
+                logger.exception("Refreshing watched query %r failed", watch.search_input)
+                changes = []
+            
+            for change in changes:
+                for subscription in list(watch.subscribers):
+                    subscription.offer(change)
+            await asyncio.sleep(self.refresh_interval)
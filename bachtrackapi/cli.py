@@ -0,0 +1,308 @@
+"""Command line interface for bulk Bachtrack crawls."""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from .scraper import BachtrackScraper, ParsePool
+from .scraper.dedup import performance_key, production_key
+
+
+class RateLimiter:
+    """Space out upstream requests across threads to at most `rate` per second."""
+
+    def __init__(self, rate: float):
+        """
+        Args:
+            rate: Maximum requests per second (0 disables limiting)
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the caller may start its next request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class JsonlSink:
+    """
+    Append events to a JSON lines file.
+
+    The committed state is the file size after a flush, so a resumed crawl
+    truncates anything written after the last checkpoint and never
+    duplicates events.
+    """
+
+    def __init__(self, path: str, state: Optional[Dict] = None):
+        self.path = path
+        self._file = open(path, 'ab')
+        if state is not None:
+            self._file.truncate(state['offset'])
+        else:
+            self._file.truncate(0)
+        self._file.seek(0, os.SEEK_END)
+
+    def records(self) -> Iterable[Dict]:
+        with open(self.path, 'rb') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def write(self, records: List[Dict]) -> None:
+        self._file.write(b''.join(json.dumps(record).encode('utf-8') + b'\n' for record in records))
+
+    def commit(self) -> Dict:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return {'offset': self._file.tell()}
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetSink:
+    """
+    Write events to a directory of Parquet part files.
+
+    Every checkpoint closes the current part, so committed parts are always
+    complete files. Parts not listed in the checkpoint are removed on resume.
+    """
+
+    def __init__(self, directory: str, state: Optional[Dict] = None):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Parquet output requires pyarrow (pip install 'bachtrackapi[parquet]')")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.parts = list(state['parts']) if state else []
+        for part in self.directory.glob('part-*.parquet'):
+            if part.name not in self.parts:
+                part.unlink()
+        self._writer = None
+
+    def records(self) -> Iterable[Dict]:
+        for part in self.parts:
+            yield from self._pq.read_table(str(self.directory / part)).to_pylist()
+
+    def write(self, records: List[Dict]) -> None:
+        if not records:
+            return
+        table = self._pa.Table.from_pylist(records)
+        if self._writer is None:
+            name = f"part-{len(self.parts):05d}-{int(time.time())}.parquet"
+            self._writer = self._pq.ParquetWriter(str(self.directory / name), table.schema)
+            self._current = name
+        self._writer.write_table(table)
+
+    def commit(self) -> Dict:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self.parts.append(self._current)
+        return {'parts': list(self.parts)}
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+class Checkpoint:
+    """Completed queries and sink state, saved atomically as JSON."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done = set()
+        self.sink_state = None
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.done = set(data['done'])
+            self.sink_state = data['sink']
+
+    def save(self, done: Iterable[str], sink_state: Dict) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'done': sorted(done), 'sink': sink_state}, f)
+        os.replace(tmp_path, self.path)
+
+
+def read_queries(path: str) -> List[str]:
+    """
+    Read one work ID or search term per line, skipping blanks, comments and repeats.
+
+    Args:
+        path: Input file
+
+    Returns:
+        Queries in file order
+    """
+    queries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            query = line.strip()
+            if query and not query.startswith('#') and query not in queries:
+                queries.append(query)
+    return queries
+
+
+def parse_query(query: str) -> Union[int, str]:
+    """Interpret a query line as a work ID if it is numeric, otherwise as freetext."""
+    return int(query) if query.isdigit() else query
+
+
+def to_record(query: str, event: Dict) -> Dict:
+    """Flatten an event for output, tagging it with the query that found it."""
+    record = {'query': query}
+    for key, value in event.items():
+        record[key] = value.isoformat() if isinstance(value, datetime) else value
+    return record
+
+
+def crawl(
+    queries: List[str],
+    sink,
+    checkpoint: Checkpoint,
+    scraper: BachtrackScraper,
+    concurrency: int = 4,
+    rate: float = 1.0,
+    checkpoint_every: float = 30.0,
+    distinct: Optional[str] = None,
+) -> int:
+    """
+    Crawl queries concurrently, streaming events to sink and checkpointing progress.
+
+    Args:
+        queries: Work IDs or search terms
+        sink: Output sink (JsonlSink or ParquetSink)
+        checkpoint: Checkpoint holding queries already completed
+        scraper: Scraper used for the searches
+        concurrency: Number of queries fetched at once
+        rate: Maximum upstream requests per second
+        checkpoint_every: Seconds between checkpoints
+        distinct: "performances" or "productions" to write each event only
+            once across all queries (including previous runs), None to write
+            every event of every query
+
+    Returns:
+        Number of queries that failed
+    """
+    limiter = RateLimiter(rate)
+    done = set(checkpoint.done)
+    pending = [query for query in queries if query not in done]
+    failures = 0
+    last_checkpoint = time.monotonic()
+
+    event_key = production_key if distinct == 'productions' else performance_key
+    seen = {event_key(record) for record in sink.records()} if distinct else None
+
+    def fetch(query: str) -> List[Dict]:
+        limiter.wait()
+        return scraper.search_operas(parse_query(query))
+
+    print(f"Crawling {len(pending)} queries ({len(done)} already done)", file=sys.stderr)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(fetch, query): query for query in pending}
+        try:
+            for future in as_completed(futures):
+                query = futures[future]
+                try:
+                    events = future.result()
+                except RuntimeError as e:
+                    failures += 1
+                    print(f"✗ {query}: {e}", file=sys.stderr)
+                    continue
+
+                if seen is not None:
+                    unique = []
+                    for event in events:
+                        key = event_key(event)
+                        if key not in seen:
+                            seen.add(key)
+                            unique.append(event)
+                    events = unique
+                sink.write([to_record(query, event) for event in events])
+                done.add(query)
+                print(f"✓ {query}: {len(events)} events", file=sys.stderr)
+
+                if time.monotonic() - last_checkpoint >= checkpoint_every:
+                    checkpoint.save(done, sink.commit())
+                    last_checkpoint = time.monotonic()
+        except KeyboardInterrupt:
+            # Keep what was written so far; the next run resumes from here
+            for future in futures:
+                future.cancel()
+            checkpoint.save(done, sink.commit())
+            raise
+
+    checkpoint.save(done, sink.commit())
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the ``bachtrackapi`` console script."""
+    parser = argparse.ArgumentParser(prog='bachtrackapi', description=__doc__)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    crawl_parser = commands.add_parser('crawl', help='Crawl work IDs or search terms listed in a file')
+    crawl_parser.add_argument('input', help='File with one work ID or search term per line')
+    crawl_parser.add_argument('-o', '--output', required=True, help='JSON lines file, or directory for Parquet parts')
+    crawl_parser.add_argument('--format', choices=['jsonl', 'parquet'], default='jsonl', help='Output format')
+    crawl_parser.add_argument('--checkpoint', help='Checkpoint file (default: <output>.checkpoint.json)')
+    crawl_parser.add_argument('--concurrency', type=int, default=4, help='Queries fetched at once')
+    crawl_parser.add_argument('--rate', type=float, default=1.0, help='Maximum upstream requests per second')
+    crawl_parser.add_argument('--checkpoint-every', type=float, default=30.0, help='Seconds between checkpoints')
+    crawl_parser.add_argument(
+        '--distinct',
+        choices=['performances', 'productions'],
+        help='Write each performance, or each production, only once across queries',
+    )
+    crawl_parser.add_argument('--parse-workers', type=int, default=0, help='Worker processes for parsing (0 parses in-process)')
+
+    args = parser.parse_args(argv)
+
+    checkpoint = Checkpoint(args.checkpoint or f"{args.output.rstrip('/')}.checkpoint.json")
+    sink_class = ParquetSink if args.format == 'parquet' else JsonlSink
+    try:
+        sink = sink_class(args.output, checkpoint.sink_state)
+    except RuntimeError as e:
+        parser.error(str(e))
+
+    parse_pool = ParsePool(args.parse_workers) if args.parse_workers else None
+    try:
+        failures = crawl(
+            read_queries(args.input),
+            sink,
+            checkpoint,
+            BachtrackScraper(parse_pool=parse_pool),
+            concurrency=args.concurrency,
+            rate=args.rate,
+            checkpoint_every=args.checkpoint_every,
+            distinct=args.distinct,
+        )
+    except KeyboardInterrupt:
+        print("Interrupted; progress saved to checkpoint", file=sys.stderr)
+        return 130
+    finally:
+        sink.close()
+        if parse_pool is not None:
+            parse_pool.close()
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
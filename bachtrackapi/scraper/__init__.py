@@ -1,3 +1,8 @@
 
 
-from .scraper import BachtrackScraper
\ No newline at end of file
+from .scraper import BachtrackScraper, MapResult
+from .resolver import WorkResolver
+from .pool import ParsePool
+from .dedup import EventIndex
+from .query import OperaQuery
+from .diagnostics import DiagnosticLog
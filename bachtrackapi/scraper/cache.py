@@ -0,0 +1,129 @@
+"""In-memory caches used by the Bachtrack scraper."""
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, List, Optional, Tuple
+import threading
+import time
+
+
+class TTLCache:
+    """Thread-safe cache with per-entry expiry and least-recently-used eviction."""
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        """
+        Args:
+            ttl: Default time-to-live of an entry, in seconds
+            max_entries: Maximum number of entries kept before evicting the oldest
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for key, or default if missing or expired.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store value under key.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time-to-live in seconds (defaults to the cache TTL)
+        """
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def remaining(self, key: Hashable) -> Optional[float]:
+        """
+        Return the seconds until key expires.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Remaining time-to-live, or None if key is missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        remaining = entry[1] - time.time()
+        return remaining if remaining > 0 else None
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key from the cache and return its value (expired or not)."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def dump(self) -> List[Tuple[Hashable, Any, float]]:
+        """
+        Return the unexpired entries, least recently used first.
+
+        Returns:
+            List of (key, value, expires_at) tuples, expires_at being a Unix timestamp
+        """
+        now = time.time()
+        with self._lock:
+            return [(key, value, expires_at) for key, (value, expires_at) in self._entries.items() if expires_at > now]
+
+    def load(self, entries: Iterable[Tuple[Hashable, Any, float]]) -> int:
+        """
+        Bulk-insert entries produced by dump, keeping their original expiry.
+
+        Args:
+            entries: (key, value, expires_at) tuples
+
+        Returns:
+            Number of entries loaded (already expired ones are skipped)
+        """
+        now = time.time()
+        loaded = 0
+        with self._lock:
+            for key, value, expires_at in entries:
+                if expires_at > now:
+                    self._entries[key] = (value, expires_at)
+                    self._entries.move_to_end(key)
+                    loaded += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return loaded
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_MISSING = object()
@@ -0,0 +1,78 @@
+"""Deduplication of events returned by several searches."""
+from datetime import datetime
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+
+def production_key(event: Dict) -> Hashable:
+    """
+    Stable identity of a production: its detail page URL.
+
+    Listings without a detail URL fall back to title, city and venue.
+    """
+    detail_url = event.get('detail_url')
+    if detail_url:
+        return str(detail_url)
+    return (event.get('title'), event.get('city'), event.get('venue'))
+
+
+def performance_key(event: Dict) -> Tuple[Hashable, str]:
+    """Stable identity of a performance: its production plus the performance datetime."""
+    date = event.get('date')
+    return production_key(event), date.isoformat() if isinstance(date, datetime) else str(date)
+
+
+class EventIndex:
+    """
+    Hash index of events merged from any number of result sets.
+
+    Both the distinct performances and the distinct productions are tracked
+    while events are added, so either view is available without a second
+    pass. The first occurrence of each event wins.
+    """
+
+    def __init__(self):
+        self._performances: Dict[Hashable, Dict] = {}
+        self._productions: Dict[Hashable, Dict] = {}
+
+    def add(self, event: Dict) -> bool:
+        """
+        Add an event to the index.
+
+        Args:
+            event: Event dictionary with detail_url and date
+
+        Returns:
+            True if the performance was not seen before
+        """
+        key = performance_key(event)
+        if key in self._performances:
+            return False
+        self._performances[key] = event
+        self._productions.setdefault(key[0], event)
+        return True
+
+    def extend(self, events: Iterable[Dict]) -> List[Dict]:
+        """
+        Add events to the index.
+
+        Args:
+            events: Event dictionaries
+
+        Returns:
+            The events whose performance was not seen before
+        """
+        return [event for event in events if self.add(event)]
+
+    def performances(self) -> List[Dict]:
+        """Distinct performances, in first-seen order."""
+        return list(self._performances.values())
+
+    def productions(self) -> List[Dict]:
+        """Distinct productions (first performance of each), in first-seen order."""
+        return list(self._productions.values())
+
+    def __contains__(self, event: Dict) -> bool:
+        return performance_key(event) in self._performances
+
+    def __len__(self) -> int:
+        return len(self._performances)
@@ -0,0 +1,101 @@
+"""Diagnostic log of slow upstream fetches, slow parses and parse failures."""
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import threading
+
+
+class DiagnosticLog:
+    """
+    Bounded log of slow operations and parse failures, with captured samples.
+
+    Fetches and parses slower than their threshold are logged with their
+    duration, and listings or date strings that fail to parse are logged
+    with a truncated HTML or text sample. Only the newest max_entries are
+    kept; the per-kind counters cover everything since start-up.
+    """
+
+    KINDS = ('slow_fetch', 'slow_parse', 'listing_failure', 'date_failure')
+
+    def __init__(
+        self,
+        max_entries: int = 500,
+        slow_fetch: float = 2.0,
+        slow_parse: float = 0.5,
+        sample_length: int = 2000,
+    ):
+        """
+        Args:
+            max_entries: Number of entries kept before the oldest are dropped
+            slow_fetch: Seconds after which an upstream fetch is logged
+            slow_parse: Seconds after which parsing a page is logged
+            sample_length: Maximum characters of a failed listing or date string kept
+        """
+        self.slow_fetch = slow_fetch
+        self.slow_parse = slow_parse
+        self.sample_length = sample_length
+        self._entries = deque(maxlen=max_entries)
+        self._counts = dict.fromkeys(self.KINDS, 0)
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str, endpoint: str, seconds: float) -> None:
+        """Log an upstream fetch if it took longer than the slow_fetch threshold."""
+        if seconds >= self.slow_fetch:
+            self._add('slow_fetch', url=url, endpoint=endpoint, seconds=round(seconds, 3))
+
+    def parse(self, url: str, size: int, seconds: float) -> None:
+        """Log the parse of a page if it took longer than the slow_parse threshold."""
+        if seconds >= self.slow_parse:
+            self._add('slow_parse', url=url, bytes=size, seconds=round(seconds, 3))
+
+    def listing_failure(self, html: str, error: Exception) -> None:
+        """Log a search listing that could not be parsed, with its markup."""
+        self._add('listing_failure', error=repr(error), sample=html[:self.sample_length])
+
+    def date_failure(self, part: str, date_str: str, error: Exception) -> None:
+        """Log a date that could not be parsed, with the full date string it came from."""
+        self._add('date_failure', error=repr(error), part=part, sample=date_str[:self.sample_length])
+
+    def extend(self, entries: List[Dict]) -> None:
+        """
+        Add entries logged elsewhere, such as in a parse worker process.
+
+        Args:
+            entries: Entries as returned by another log's entries(), oldest first
+        """
+        with self._lock:
+            for entry in entries:
+                self._entries.append(dict(entry))
+                self._counts[entry['kind']] += 1
+
+    def entries(self, kind: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Return logged entries, newest first.
+
+        Args:
+            kind: Only return entries of this kind (one of KINDS)
+            limit: Maximum number of entries returned
+
+        Returns:
+            Entry dictionaries with ``time``, ``kind`` and kind-specific fields
+        """
+        with self._lock:
+            entries = [dict(entry) for entry in reversed(self._entries) if kind is None or entry['kind'] == kind]
+        return entries[:limit] if limit is not None else entries
+
+    def counts(self) -> Dict[str, int]:
+        """Number of events of each kind since start-up, including entries rotated out."""
+        with self._lock:
+            return dict(self._counts)
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._counts = dict.fromkeys(self.KINDS, 0)
+
+    def _add(self, kind: str, **fields) -> None:
+        entry = {'time': datetime.now(timezone.utc).isoformat(), 'kind': kind, **fields}
+        with self._lock:
+            self._entries.append(entry)
+            self._counts[kind] += 1
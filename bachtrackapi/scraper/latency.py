@@ -0,0 +1,231 @@
+"""Adaptive timeouts and hedged requests for upstream fetches."""
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Optional
+import threading
+import time
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class LatencyTracker:
+    """Rolling window of fetch latencies per endpoint."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        Args:
+            window: Number of recent latencies kept per endpoint
+            min_samples: Samples needed before percentiles are reported
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        """Record the latency of a fetch (the timeout, for fetches that timed out)."""
+        with self._lock:
+            self._samples.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+
+    def endpoints(self):
+        """Names of the endpoints with recorded latencies."""
+        with self._lock:
+            return list(self._samples)
+
+    def percentile(self, endpoint: str, p: float) -> Optional[float]:
+        """
+        Return the p-th percentile latency of an endpoint.
+
+        Args:
+            endpoint: Endpoint name, e.g. "search" or "detail"
+            p: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None until min_samples have been recorded
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(endpoint, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+class UpstreamFetcher:
+    """
+    GET requests with timeouts adapted to observed latency and optional hedging.
+
+    Each thread gets its own requests.Session, since sessions are not
+    guaranteed to be thread-safe, but all of them share one HTTPAdapter, so
+    keep-alive connections to the upstream are pooled across threads.
+
+    The timeout of an endpoint is a multiple of its p99 latency, clamped
+    between min_timeout and max_timeout; until enough samples exist
+    max_timeout is used. With hedging enabled, a fetch still pending after
+    the endpoint's p95 latency gets a duplicate request and the first
+    response wins. Hedges are capped at hedge_budget times the number of
+    fetches.
+    """
+
+    def __init__(
+        self,
+        max_timeout: float = 10.0,
+        min_timeout: float = 1.0,
+        timeout_multiplier: float = 3.0,
+        hedging: bool = False,
+        hedge_budget: float = 0.05,
+        max_workers: int = 32,
+        pool_size: int = 32,
+    ):
+        """
+        Args:
+            max_timeout: Upper bound (and initial value) of the timeout, in seconds
+            min_timeout: Lower bound of the timeout, in seconds
+            timeout_multiplier: Timeout as a multiple of the p99 latency
+            hedging: Send a duplicate request when a fetch passes its p95 latency
+            hedge_budget: Maximum hedges as a fraction of all fetches
+            max_workers: Threads used to run hedged fetches
+            pool_size: Keep-alive connections kept per host, shared by all threads
+        """
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.timeout_multiplier = timeout_multiplier
+        self.hedging = hedging
+        self.hedge_budget = hedge_budget
+        self.max_workers = max_workers
+        self.latency = LatencyTracker()
+        self._stats = {'fetches': 0, 'timeouts': 0, 'hedges_fired': 0, 'hedges_won': 0}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._local = threading.local()
+        # Weak, so sessions of finished threads are released
+        self._sessions = weakref.WeakSet()
+
+    def timeout(self, endpoint: str) -> float:
+        """Current timeout of an endpoint, in seconds."""
+        p99 = self.latency.percentile(endpoint, 99)
+        if p99 is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p99 * self.timeout_multiplier))
+
+    def get(self, url: str, endpoint: str, **kwargs) -> requests.Response:
+        """
+        Fetch a URL.
+
+        Args:
+            url: URL to fetch
+            endpoint: Endpoint name the latency is tracked under
+            **kwargs: Passed on to Session.get (headers, stream, ...)
+
+        Returns:
+            The response (status is not checked)
+
+        Raises:
+            requests.RequestException: If the fetch fails or times out
+        """
+        self._count('fetches')
+        hedge_after = self.latency.percentile(endpoint, 95) if self.hedging else None
+        if hedge_after is None:
+            return self._timed_get(url, endpoint, **kwargs)
+
+        executor = self._get_executor()
+        primary = executor.submit(self._timed_get, url, endpoint, **kwargs)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done or not self._allow_hedge():
+            return primary.result()
+
+        self._count('hedges_fired')
+        hedge = executor.submit(self._timed_get, url, endpoint, **kwargs)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                if future is hedge:
+                    self._count('hedges_won')
+                for loser in pending:
+                    loser.add_done_callback(_close_response)
+                return future.result()
+        raise error
+
+    def metrics(self) -> Dict:
+        """Counters plus current p50/p95/p99 latency and timeout per endpoint."""
+        with self._lock:
+            metrics = dict(self._stats)
+        metrics['endpoints'] = {
+            endpoint: {
+                'p50': self.latency.percentile(endpoint, 50),
+                'p95': self.latency.percentile(endpoint, 95),
+                'p99': self.latency.percentile(endpoint, 99),
+                'timeout': self.timeout(endpoint),
+            }
+            for endpoint in self.latency.endpoints()
+        }
+        return metrics
+
+    def _timed_get(self, url: str, endpoint: str, **kwargs) -> requests.Response:
+        """
+        Session.get with the endpoint's timeout, recording the latency of successes and timeouts.
+
+        A timed-out fetch is recorded at its timeout, so when the upstream
+        slows down past the current timeout the p99, and with it the
+        timeout, grows again instead of staying stuck.
+        """
+        timeout = self.timeout(endpoint)
+        start = time.monotonic()
+        try:
+            response = self.session().get(url, timeout=timeout, **kwargs)
+        except requests.Timeout:
+            self._count('timeouts')
+            self.latency.record(endpoint, max(timeout, time.monotonic() - start))
+            raise
+        self.latency.record(endpoint, time.monotonic() - start)
+        return response
+
+    def close(self) -> None:
+        """Stop the hedging threads and close the pooled connections."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        with self._lock:
+            sessions, self._sessions = list(self._sessions), weakref.WeakSet()
+        for session in sessions:
+            session.close()
+        self._adapter.close()
+
+    def session(self) -> requests.Session:
+        """Session of the calling thread, mounted on the shared connection pool."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.mount('http://', self._adapter)
+            session.mount('https://', self._adapter)
+            with self._lock:
+                self._sessions.add(session)
+        return session
+
+    def _allow_hedge(self) -> bool:
+        with self._lock:
+            return self._stats['hedges_fired'] < self.hedge_budget * self._stats['fetches']
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='hedge')
+            return self._executor
+
+
+def _close_response(future) -> None:
+    """Release the connection of a fetch that lost a hedge race."""
+    if future.exception() is None:
+        future.result().close()
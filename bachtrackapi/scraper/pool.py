@@ -0,0 +1,113 @@
+"""Process pool for CPU-bound parsing of search result pages."""
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Optional
+import os
+import threading
+
+from .diagnostics import DiagnosticLog
+from .scraper import Listing, parse_search_page_with_failures
+
+
+class ParsePool:
+    """
+    Parse search result pages in worker processes.
+    
+    Network I/O stays in the calling process; only raw HTML bytes go to the
+    workers and only compact Listing tuples, plus any parse failures, come
+    back; the failures are added to the caller's DiagnosticLog. Small pages are parsed
+    in-process, where pickling would cost more than the parse. The number of
+    pages queued for the workers is bounded, so producers block instead of
+    piling up HTML in memory.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None, inline_threshold: int = 32 * 1024):
+        """
+        Args:
+            max_workers: Number of worker processes (defaults to the CPU count)
+            max_pending: Maximum pages submitted but not yet parsed (defaults to twice max_workers)
+            inline_threshold: Pages smaller than this many bytes are parsed in-process
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.inline_threshold = inline_threshold
+        self._pending = threading.BoundedSemaphore(max_pending or 2 * self.max_workers)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, content: bytes, diagnostics: Optional[DiagnosticLog] = None) -> Future:
+        """
+        Schedule a page for parsing, blocking while the pool is saturated.
+        
+        Args:
+            content: Raw HTML of the search results page
+            diagnostics: Log receiving the listings and dates that failed to parse
+            
+        Returns:
+            Future resolving to the list of Listing tuples
+        """
+        if len(content) < self.inline_threshold:
+            raw = Future()
+            try:
+                raw.set_result(parse_search_page_with_failures(content))
+            except Exception as e:
+                raw.set_exception(e)
+            return self._unpack(raw, diagnostics)
+
+        self._pending.acquire()
+        try:
+            raw = self._get_executor().submit(parse_search_page_with_failures, content)
+        except Exception:
+            self._pending.release()
+            raise
+        raw.add_done_callback(lambda _: self._pending.release())
+        return self._unpack(raw, diagnostics)
+
+    def parse(self, content: bytes, diagnostics: Optional[DiagnosticLog] = None) -> List[Listing]:
+        """
+        Parse a page and wait for the result.
+        
+        Args:
+            content: Raw HTML of the search results page
+            diagnostics: Log receiving the listings and dates that failed to parse
+            
+        Returns:
+            List of Listing tuples
+        """
+        return self.submit(content, diagnostics).result()
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    @staticmethod
+    def _unpack(raw: Future, diagnostics: Optional[DiagnosticLog]) -> Future:
+        """Future of the listings of a parse, logging its failures to diagnostics when it completes."""
+        future = Future()
+
+        def done(raw: Future) -> None:
+            try:
+                listings, failures = raw.result()
+            except Exception as e:
+                future.set_exception(e)
+                return
+            if diagnostics is not None:
+                diagnostics.extend(failures)
+            future.set_result(listings)
+
+        raw.add_done_callback(done)
+        return future
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the worker processes on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,95 @@
+"""Structured search queries."""
+from datetime import date, datetime
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from .resolver import WorkResolver
+
+
+class OperaQuery(NamedTuple):
+    """
+    A search by work ID or freetext, optionally narrowed by place and date.
+
+    The work or freetext selects the upstream search page; bachtrack's search
+    URLs take no other filter that can be relied on, so city, venue and the
+    date window are applied while the page is parsed. Listings in another
+    place are dropped before their dates are parsed, and dates outside the
+    window are dropped before listings are expanded to events.
+    """
+    work_id: Optional[int] = None
+    freetext: Optional[str] = None
+    city: Optional[str] = None
+    venue: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+
+    @classmethod
+    def coerce(cls, search_input: Union[int, str, 'OperaQuery']) -> 'OperaQuery':
+        """
+        Turn a work ID or freetext search into a query.
+
+        Args:
+            search_input: Work ID, freetext search term or OperaQuery
+
+        Returns:
+            OperaQuery (search_input itself if it already is one)
+        """
+        if isinstance(search_input, OperaQuery):
+            return search_input
+        if isinstance(search_input, int):
+            return cls(work_id=search_input)
+        return cls(freetext=search_input)
+
+    @property
+    def search_input(self) -> Union[int, str]:
+        """The work ID or freetext term that selects the upstream page."""
+        if (self.work_id is None) == (self.freetext is None):
+            raise ValueError("OperaQuery needs exactly one of work_id and freetext")
+        return self.work_id if self.work_id is not None else self.freetext
+
+    def local_filters(self) -> Dict[str, str]:
+        """
+        Filters applied during parsing, normalized and in a fixed order.
+
+        Returns:
+            Mapping of filter name to normalized value, empty if the query is unfiltered
+        """
+        filters = {}
+        if self.city:
+            filters['city'] = WorkResolver.normalize(self.city)
+        if self.venue:
+            filters['venue'] = WorkResolver.normalize(self.venue)
+        if self.date_from is not None:
+            filters['date_from'] = _as_date(self.date_from).isoformat()
+        if self.date_to is not None:
+            filters['date_to'] = _as_date(self.date_to).isoformat()
+        return filters
+
+    def accepts_place(self, city: str, venue: str) -> bool:
+        """
+        Check a listing's place against the city and venue filters.
+
+        The city must match exactly and the venue filter may be any part of
+        the venue name, both compared after normalization.
+        """
+        if self.city and WorkResolver.normalize(city) != WorkResolver.normalize(self.city):
+            return False
+        if self.venue and WorkResolver.normalize(self.venue) not in WorkResolver.normalize(venue):
+            return False
+        return True
+
+    def accepts_event(self, event: Dict) -> bool:
+        """Check an expanded event against the place and date filters."""
+        return self.accepts_place(event['city'], event['venue']) and bool(self.within_window([event['date']]))
+
+    def within_window(self, dates: List[datetime]) -> List[datetime]:
+        """Return the dates that fall inside the date window (both ends inclusive)."""
+        if self.date_from is None and self.date_to is None:
+            return dates
+        start = _as_date(self.date_from) if self.date_from is not None else date.min
+        end = _as_date(self.date_to) if self.date_to is not None else date.max
+        return [value for value in dates if start <= value.date() <= end]
+
+
+def _as_date(value: date) -> date:
+    """Drop the time of a datetime so it compares with dates."""
+    return value.date() if isinstance(value, datetime) else value
@@ -0,0 +1,142 @@
+"""Resolution of freetext searches to Bachtrack work IDs."""
+from typing import Dict, Iterable, Optional, Tuple, Union
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+
+
+WORK_ID_PATTERN = re.compile(r'work=(\d+)')
+
+
+class WorkResolver:
+    """
+    Learn which freetext searches correspond to a single Bachtrack work.
+
+    A freetext search is mapped to a work only when every listing it
+    returned links explicitly to that same work, and only after
+    min_observations such searches agreed with no disagreeing one in
+    between. Mappings expire after ttl seconds; the freetext URL is then
+    searched again and the mapping has to be re-confirmed. When a path is
+    given, confirmed mappings are appended to a JSON lines file and replayed
+    on startup, keeping their original expiry.
+    """
+
+    MAPPING_TTL = 7 * 24 * 60 * 60
+
+    def __init__(self, path: Optional[str] = None, min_observations: int = 3, ttl: float = MAPPING_TTL):
+        """
+        Args:
+            path: Optional JSON lines file used to persist learned mappings
+            min_observations: Agreeing searches needed before a mapping is used
+            ttl: Seconds a mapping is used before it has to be re-confirmed
+        """
+        self.path = path
+        self.min_observations = min_observations
+        self.ttl = ttl
+        # normalized freetext -> (work_id, expires_at)
+        self._freetext: Dict[str, Tuple[int, float]] = {}
+        # normalized freetext -> (work_id, agreeing observations so far)
+        self._candidates: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self._load(path)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Normalize a freetext search: unicode-compose, casefold and collapse whitespace.
+
+        Args:
+            text: Raw search term, e.g. "Gianni  Schicchi"
+
+        Returns:
+            Normalized search term, e.g. "gianni schicchi"
+        """
+        text = unicodedata.normalize('NFKC', text)
+        return ' '.join(text.casefold().split())
+
+    def resolve(self, search_input: Union[int, str]) -> Optional[int]:
+        """
+        Return the work ID a search input stands for, if known.
+
+        Args:
+            search_input: Work ID or freetext search term
+
+        Returns:
+            Work ID, or None if the freetext has no confirmed, unexpired mapping
+        """
+        if isinstance(search_input, int):
+            return search_input
+        normalized = self.normalize(search_input)
+        if normalized.isdigit():
+            return int(normalized)
+        with self._lock:
+            mapping = self._freetext.get(normalized)
+            if mapping is None:
+                return None
+            if mapping[1] <= time.time():
+                del self._freetext[normalized]
+                return None
+            return mapping[0]
+
+    def learn(self, search_input: Union[int, str], listings: Iterable[Tuple[Optional[str], Optional[int]]]) -> None:
+        """
+        Update mappings from the listings returned by a search.
+
+        Only freetext searches teach anything: the search counts as an
+        observation of a work when every listing links to that work
+        explicitly. Any other result discards the observations made so far.
+
+        Args:
+            search_input: Work ID or freetext search term that was fetched
+            listings: (detail_url, work_id) pairs, one per listing; work_id is
+                the ID found in the listing markup or None
+        """
+        if isinstance(search_input, int):
+            return
+        normalized = self.normalize(search_input)
+        if normalized.isdigit():
+            return
+        work_ids = {listing_work_id for _, listing_work_id in listings}
+
+        with self._lock:
+            if len(work_ids) != 1 or None in work_ids:
+                self._candidates.pop(normalized, None)
+                return
+            work_id = work_ids.pop()
+            candidate, observations = self._candidates.get(normalized, (work_id, 0))
+            observations = observations + 1 if candidate == work_id else 1
+            if observations < self.min_observations:
+                self._candidates[normalized] = (work_id, observations)
+                return
+            self._candidates.pop(normalized, None)
+            expires_at = time.time() + self.ttl
+            self._freetext[normalized] = (work_id, expires_at)
+            if self.path:
+                self._append([{'freetext': normalized, 'work_id': work_id, 'expires_at': expires_at}])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._freetext)
+
+    def _load(self, path: str) -> None:
+        """Replay a JSON lines mapping file, skipping corrupt, expired and unversioned lines."""
+        now = time.time()
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    # Lines without an expiry predate confirmed learning and are not trusted
+                    if 'freetext' in record and float(record['expires_at']) > now:
+                        self._freetext[record['freetext']] = (int(record['work_id']), float(record['expires_at']))
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+    def _append(self, records) -> None:
+        """Append new mappings to the persistence file."""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
@@ -1,18 +1,93 @@
 """Bachtrack.com scraper for opera events."""
-from typing import List, Dict, Union
+from typing import Any, Callable, Iterable, Iterator, List, Dict, NamedTuple, Optional, Tuple, Union
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
+import codecs
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import quote
+from bs4 import BeautifulSoup, SoupStrainer
+from urllib.parse import quote, urlencode
 import re
+import threading
+import time
+
+from .cache import TTLCache
+from .diagnostics import DiagnosticLog
+from .latency import UpstreamFetcher
+from .query import OperaQuery
+from .resolver import WorkResolver, WORK_ID_PATTERN
+from .streaming import ListingStreamParser
+
+
+class Listing(NamedTuple):
+    """Compact parse result for one search listing, before expansion to one event per date."""
+    title: str
+    city: str
+    venue: str
+    detail_url: Optional[str]
+    work_id: Optional[int]
+    dates: List[datetime]
+
+
+class MapResult(NamedTuple):
+    """Outcome of one item of map_search or map_details."""
+    item: Any
+    value: Any
+    error: Optional[Exception]
 
 
 class BachtrackScraper:
-    """Scraper for Bachtrack opera events."""
+    """
+    Scraper for Bachtrack opera events.
+    
+    A scraper is thread-safe: its caches, resolver, upstream fetcher and
+    diagnostic log are locked internally, and all threads share the
+    fetcher's keep-alive connection pool. map_search and map_details run
+    many searches or detail fetches on an internal thread pool for
+    synchronous callers.
+    """
 
     BASE_URL = "https://bachtrack.com"
+    SEARCH_CACHE_TTL = 15 * 60
+    DETAIL_CACHE_TTL = 24 * 60 * 60
+    VENUE_CACHE_TTL = 30 * 24 * 60 * 60
+    MISSING_DETAIL_TTL = 60 * 60
+    
+    # Only the parts of a detail page that get_event_details reads
+    DETAIL_CLASSES = frozenset(['listing-address', 'plassmap_table'])
+    DETAIL_STRAINER = SoupStrainer(
+        ['span', 'tbody'],
+        attrs={'class': lambda value: bool(value) and not BachtrackScraper.DETAIL_CLASSES.isdisjoint(
+            value.split() if isinstance(value, str) else value
+        )},
+    )
     
-    def __init__(self):
+    def __init__(
+        self,
+        resolver: Optional[WorkResolver] = None,
+        search_cache_ttl: float = SEARCH_CACHE_TTL,
+        detail_cache_ttl: float = DETAIL_CACHE_TTL,
+        venue_cache_ttl: float = VENUE_CACHE_TTL,
+        parse_pool=None,
+        incremental: bool = False,
+        fetcher: Optional[UpstreamFetcher] = None,
+        diagnostics: Optional[DiagnosticLog] = None,
+        max_workers: int = 8,
+    ):
+        """
+        Args:
+            resolver: Freetext-to-work-ID resolver (an in-memory one is created if omitted)
+            search_cache_ttl: Seconds a search result page stays cached
+            detail_cache_ttl: Seconds a parsed event detail page stays cached
+            venue_cache_ttl: Seconds a venue address stays cached
+            parse_pool: Optional ParsePool that parses search pages in worker processes
+            incremental: Parse search pages listing by listing while they download
+            fetcher: UpstreamFetcher with adaptive timeouts and optional hedging
+                (one without hedging is created if omitted)
+            diagnostics: DiagnosticLog receiving slow fetches, slow parses and
+                parse failures (one with default thresholds is created if omitted)
+            max_workers: Threads of the pool used by map_search and map_details
+        """
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9',
@@ -21,46 +96,389 @@ class BachtrackScraper:
             'Upgrade-Insecure-Requests': '1',
             'Connection': 'keep-alive'
         }
+        self.resolver = resolver if resolver is not None else WorkResolver()
+        self.search_cache = TTLCache(ttl=search_cache_ttl)
+        self.detail_cache = TTLCache(ttl=detail_cache_ttl, max_entries=16384)
+        self.missing_details = TTLCache(ttl=self.MISSING_DETAIL_TTL, max_entries=4096)
+        self.venue_cache = TTLCache(ttl=venue_cache_ttl, max_entries=16384)
+        self.parse_pool = parse_pool
+        self.incremental = incremental
+        self.fetcher = fetcher or UpstreamFetcher()
+        self.diagnostics = diagnostics or DiagnosticLog()
+        # Called as listener(search_url, events) after every upstream search fetch
+        self.fetch_listeners: List[Callable[[str, List[Dict]], None]] = []
+        self.max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def map_search(
+        self,
+        search_inputs: Iterable[Union[int, str, OperaQuery]],
+        max_workers: Optional[int] = None,
+        ordered: bool = True,
+    ) -> Iterator[MapResult]:
+        """
+        Run searches concurrently.
+        
+        Args:
+            search_inputs: Work IDs, search terms or OperaQuery objects
+            max_workers: Searches in flight at once (defaults to the pool size)
+            ordered: Yield results in input order; otherwise as they complete
+            
+        Returns:
+            Iterator of MapResult(search_input, events, error); a failed
+            search has events None and the exception as error
+        """
+        return self._map(self.search_operas, search_inputs, max_workers, ordered)
+
+    def map_details(
+        self,
+        detail_urls: Iterable[str],
+        max_workers: Optional[int] = None,
+        ordered: bool = True,
+    ) -> Iterator[MapResult]:
+        """
+        Fetch event detail pages concurrently.
+        
+        Args:
+            detail_urls: URLs of event detail pages
+            max_workers: Pages in flight at once (defaults to the pool size)
+            ordered: Yield results in input order; otherwise as they complete
+            
+        Returns:
+            Iterator of MapResult(detail_url, details, error); a failed
+            fetch has details None and the exception as error
+        """
+        return self._map(self.get_event_details, detail_urls, max_workers, ordered)
+
+    def close(self) -> None:
+        """Shut down the thread pool used by map_search and map_details."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def _map(self, func: Callable, items: Iterable, max_workers: Optional[int], ordered: bool) -> Iterator[MapResult]:
+        """Submit the first window of items right away and return an iterator over their results."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scraper')
+            executor = self._executor
+        items = iter(items)
+        pending = deque()
+
+        def submit_next() -> None:
+            for item in items:
+                pending.append((item, executor.submit(func, item)))
+                return
+
+        for _ in range(max_workers or self.max_workers):
+            submit_next()
+        return self._collect(pending, submit_next, ordered)
+
+    @staticmethod
+    def _collect(pending: deque, submit_next: Callable[[], None], ordered: bool) -> Iterator[MapResult]:
+        """Yield results of submitted items, submitting another item for each one finished."""
+        while pending:
+            if ordered:
+                finished = [pending.popleft()]
+                wait([finished[0][1]])
+            else:
+                done, _ = wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                finished = [entry for entry in pending if entry[1] in done]
+                for entry in finished:
+                    pending.remove(entry)
+            for item, future in finished:
+                submit_next()
+                error = future.exception()
+                yield MapResult(item, None if error is not None else future.result(), error)
+
+    def search_url(self, search_input: Union[int, str, OperaQuery]) -> str:
+        """
+        Build the canonical search URL for a work ID or freetext search.
+        
+        Freetext searches that the resolver maps to a work ID are routed to the
+        work URL, so every spelling of the same opera shares one URL.
+        
+        Args:
+            search_input: Integer work ID, string search term or OperaQuery
+            
+        Returns:
+            Absolute search URL
+        """
+        search_input = OperaQuery.coerce(search_input).search_input
+        work_id = self.resolver.resolve(search_input)
+        if work_id is not None:
+            return f"{self.BASE_URL}/search-opera/work={work_id}"
+        encoded_search = quote(self.resolver.normalize(search_input))
+        return f"{self.BASE_URL}/search-opera/freetext={encoded_search}"
+
+    def cache_key(self, search_input: Union[int, str, OperaQuery]) -> str:
+        """
+        Build the key a search is cached under.
+        
+        This is the search URL, followed by the normalized filters applied
+        during parsing when the query has any, so equivalent queries share
+        one entry and differently filtered ones never do.
+        
+        Args:
+            search_input: Integer work ID, string search term or OperaQuery
+            
+        Returns:
+            Cache key
+        """
+        query = OperaQuery.coerce(search_input)
+        search_url = self.search_url(query)
+        filters = query.local_filters()
+        return f"{search_url}?{urlencode(filters)}" if filters else search_url
 
-    def search_operas(self, search_input: Union[int, str]) -> List[Dict]:
+    def search_operas(self, search_input: Union[int, str, OperaQuery]) -> List[Dict]:
         """
-        Search for opera events by work ID or freetext search.
+        Search for opera events by work ID, freetext search or structured query.
         
         Args:
-            search_input: Either an integer work ID (e.g., 12285) or a string search term (e.g., "Il barbiere di Siviglia")
+            search_input: Either an integer work ID (e.g., 12285), a string search term
+                (e.g., "Il barbiere di Siviglia") or an OperaQuery narrowing either
+                by city, venue and dates
             
         Returns:
             List of opera event dictionaries with city, date, venue, title
         """
-        if isinstance(search_input, int):
-            # Search by work ID
-            search_url = f"{self.BASE_URL}/search-opera/work={search_input}"
-        else:
-            # Search by freetext
-            encoded_search = quote(search_input)
-            search_url = f"{self.BASE_URL}/search-opera/freetext={encoded_search}"
+        if self.incremental:
+            return list(self.iter_search(search_input))
+        
+        query = OperaQuery.coerce(search_input)
+        search_url = self.search_url(query)
+        cache_key = self.cache_key(query)
+        cached = self._cached_search(query, search_url, cache_key)
+        if cached is not None:
+            return [dict(event) for event in cached]
         
         try:
-            response = requests.get(search_url, headers=self.headers, timeout=10)
+            response = self._fetch(search_url, 'search', headers=self.headers)
             response.raise_for_status()
         except requests.RequestException as e:
             raise RuntimeError(f"Failed to fetch search results: {e}")
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+        start = time.monotonic()
+        if self.parse_pool is not None:
+            listings = self._filter_listings(self.parse_pool.parse(response.content, self.diagnostics), query)
+        else:
+            listings = self.parse_search_page(response.content, query)
+        self.diagnostics.parse(search_url, len(response.content), time.monotonic() - start)
+        events = self.expand_listings(listings)
+        
+        self._store_search(query, cache_key, listings, events)
+        return [dict(event) for event in events]
+
+    def iter_search(self, search_input: Union[int, str, OperaQuery], chunk_size: int = 16 * 1024) -> Iterator[Dict]:
+        """
+        Search for opera events, yielding each event as soon as its listing has downloaded.
+        
+        The page is fed to an incremental parser chunk by chunk, so only the
+        listing being downloaded is buffered and the first events arrive
+        before the download completes. The complete result is cached like
+        search_operas once the page has been read to the end.
+        
+        Args:
+            search_input: Integer work ID, string search term or OperaQuery
+            chunk_size: Bytes read from the connection at a time
+            
+        Yields:
+            Opera event dictionaries with city, date, venue, title
+        """
+        query = OperaQuery.coerce(search_input)
+        search_url = self.search_url(query)
+        cache_key = self.cache_key(query)
+        cached = self._cached_search(query, search_url, cache_key)
+        if cached is not None:
+            for event in cached:
+                yield dict(event)
+            return
         
-        # Extract opera events from listing
+        # Download and parse time are summed over the chunks, leaving out the
+        # time the caller spends on yielded events, and logged at the end
+        start = time.monotonic()
+        try:
+            response = self.fetcher.get(search_url, 'search', headers=self.headers, stream=True)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise RuntimeError(f"Failed to fetch search results: {e}")
+        fetch_time = time.monotonic() - start
+        parse_time = 0.0
+        size = 0
+        
+        parser = ListingStreamParser()
+        # requests falls back to ISO-8859-1 for text/html without a charset; the site serves UTF-8
+        has_charset = 'charset=' in response.headers.get('Content-Type', '').lower()
+        encoding = response.encoding if has_charset and response.encoding else 'utf-8'
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        listings = []
         events = []
+        try:
+            chunks = response.iter_content(chunk_size=chunk_size)
+            while True:
+                start = time.monotonic()
+                chunk = next(chunks, None)
+                fetch_time += time.monotonic() - start
+                if chunk is None:
+                    break
+                size += len(chunk)
+                start = time.monotonic()
+                parser.feed(decoder.decode(chunk))
+                new_events = self._drain_listings(parser, query, listings, events)
+                parse_time += time.monotonic() - start
+                for event in new_events:
+                    yield dict(event)
+        except requests.RequestException as e:
+            raise RuntimeError(f"Failed to fetch search results: {e}")
+        finally:
+            response.close()
+        start = time.monotonic()
+        parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+        new_events = self._drain_listings(parser, query, listings, events)
+        parse_time += time.monotonic() - start
+        self.diagnostics.fetch(search_url, 'search', fetch_time)
+        self.diagnostics.parse(search_url, size, parse_time)
+        for event in new_events:
+            yield dict(event)
+        
+        self._store_search(query, cache_key, listings, events)
+
+    def _drain_listings(
+        self, parser: ListingStreamParser, query: OperaQuery, listings: List[Listing], events: List[Dict]
+    ) -> List[Dict]:
+        """Parse the listings the stream parser has completed, collecting and returning their events."""
+        new_events = []
+        for fragment in parser.pop_listings():
+            try:
+                listing = self._parse_listing(BeautifulSoup(fragment, 'html.parser').li, query)
+            except (AttributeError, ValueError) as e:
+                # Skip malformed elements
+                self.diagnostics.listing_failure(fragment, e)
+                continue
+            if not listing or not listing.dates:
+                continue
+            listings.append(listing)
+            new_events.extend(self.expand_listings([listing]))
+        events.extend(new_events)
+        return new_events
+
+    def _cached_search(self, query: OperaQuery, search_url: str, cache_key: str) -> Optional[List[Dict]]:
+        """
+        Return the cached events of a query, or None on a miss.
+        
+        A filtered query missing from the cache is answered from the cached
+        unfiltered page when there is one; the filtered result is then
+        cached for as long as the unfiltered one remains valid.
+        """
+        cached = self.search_cache.get(cache_key)
+        if cached is not None or cache_key == search_url:
+            return cached
+        unfiltered = self.search_cache.get(search_url)
+        remaining = self.search_cache.remaining(search_url)
+        if unfiltered is None or remaining is None:
+            return None
+        cached = [event for event in unfiltered if query.accepts_event(event)]
+        self.search_cache.set(cache_key, cached, ttl=remaining)
+        return cached
+
+    def _fetch(self, url: str, endpoint: str, **kwargs) -> requests.Response:
+        """Fetch a URL through the upstream fetcher, logging it if it was slow."""
+        start = time.monotonic()
+        response = self.fetcher.get(url, endpoint, **kwargs)
+        self.diagnostics.fetch(url, endpoint, time.monotonic() - start)
+        return response
+
+    def _store_search(self, query: OperaQuery, cache_key: str, listings: List[Listing], events: List[Dict]) -> None:
+        """Cache a freshly fetched search, teach the resolver and notify fetch listeners."""
+        # Only an unrouted, unfiltered freetext search shows everything the text matches
+        if self.resolver.resolve(query.search_input) is None and not query.local_filters():
+            self.resolver.learn(query.search_input, [(listing.detail_url, listing.work_id) for listing in listings])
+        self.search_cache.set(cache_key, events)
+        for listener in self.fetch_listeners:
+            listener(cache_key, events)
+
+    def _filter_listings(self, listings: List[Listing], query: OperaQuery) -> List[Listing]:
+        """Apply the place and date filters of a query to already parsed listings."""
+        if not query.local_filters():
+            return listings
+        filtered = []
+        for listing in listings:
+            if query.accepts_place(listing.city, listing.venue):
+                listing = listing._replace(dates=query.within_window(listing.dates))
+                if listing.dates:
+                    filtered.append(listing)
+        return filtered
+
+    def parse_search_page(self, content: bytes, query: Optional[OperaQuery] = None) -> List[Listing]:
+        """
+        Parse a search results page into compact listings.
+        
+        Args:
+            content: Raw HTML of the search results page
+            query: Optional query whose place and date filters are applied while parsing
+            
+        Returns:
+            One Listing per event listing that has at least one parsable date
+            (within the query's filters)
+        """
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        listings = []
         li_elements = soup.find_all('li', {'data-type': 'nothing'})
         
         for element in li_elements:
             try:
-                event_list = self._parse_event_element(element)
-                events.extend(event_list)
+                listing = self._parse_listing(element, query)
             except (AttributeError, ValueError) as e:
                 # Skip malformed elements
+                self.diagnostics.listing_failure(str(element), e)
                 continue
+            if listing and listing.dates:
+                listings.append(listing)
         
-        return events
+        return listings
+
+    @staticmethod
+    def expand_listings(listings: List[Listing]) -> List[Dict]:
+        """
+        Expand listings to one event dictionary per date.
+        
+        Args:
+            listings: Listings as returned by parse_search_page
+            
+        Returns:
+            List of event dictionaries with title, city, date, venue, detail_url
+        """
+        return [
+            {
+                'title': listing.title,
+                'city': listing.city,
+                'date': parsed_date,
+                'venue': listing.venue,
+                'detail_url': listing.detail_url,
+            }
+            for listing in listings
+            for parsed_date in listing.dates
+        ]
+
+    def _extract_work_id(self, element) -> Optional[int]:
+        """
+        Find the work ID a listing links to, if any.
+        
+        Args:
+            element: BeautifulSoup element representing an event listing
+            
+        Returns:
+            Work ID from the first ``work=<id>`` link, or None
+        """
+        for link in element.find_all('a', href=True):
+            match = WORK_ID_PATTERN.search(link['href'])
+            if match:
+                return int(match.group(1))
+        return None
 
     def _parse_event_element(self, element) -> List[Dict]:
         """
@@ -72,10 +490,29 @@ class BachtrackScraper:
         Returns:
             List of dictionaries with event details, one per date
         """
+        listing = self._parse_listing(element)
+        return self.expand_listings([listing]) if listing else []
+
+    def _parse_listing(self, element, query: Optional[OperaQuery] = None) -> Optional[Listing]:
+        """
+        Parse individual event element into a compact Listing.
+        
+        Args:
+            element: BeautifulSoup element representing an event listing
+            query: Optional query; listings in another place are skipped
+                before their dates are parsed, and dates outside its window
+                are dropped
+            
+        Returns:
+            Listing with all parsed dates, or None if required fields are
+            missing or the listing is filtered out
+        """
         try:
             city = element.find('div', {'class': 'listing-ms-city'}).text.strip()
             date_str = element.find('div', {'class': 'listing-ms-dates'}).text.strip()
             venue = element.find('div', {'class': 'listing-ms-venue'}).text.strip()
+            if query is not None and not query.accepts_place(city, venue):
+                return None
             
             # Extract title from listing-ms-main, removing Wish list button
             main_div = element.find('div', {'class': 'listing-ms-main'})
@@ -83,28 +520,25 @@ class BachtrackScraper:
             # Remove the wish list placeholder text
             title = title.replace('Wish list', '').strip()
             
+            dates = self._parse_dates_list(date_str)
+            
             # Get detail page URL
             detail_link = element.find('a', {'class': 'listing-ms-right'})
             detail_url = None
             if detail_link and detail_link.get('href'):
                 detail_url = f"{self.BASE_URL}{detail_link['href']}"
             
-            # Parse dates and create one event per date
-            parsed_dates = self._parse_dates_list(date_str)
-            events = []
-            
-            for parsed_date in parsed_dates:
-                events.append({
-                    'title': title,
-                    'city': city,
-                    'date': parsed_date,
-                    'venue': venue,
-                    'detail_url': detail_url,
-                })
-            
-            return events
-        except (AttributeError, TypeError):
-            return []
+            return Listing(
+                title=title,
+                city=city,
+                venue=venue,
+                detail_url=detail_url,
+                work_id=self._extract_work_id(element),
+                dates=query.within_window(dates) if query is not None else dates,
+            )
+        except (AttributeError, TypeError) as e:
+            self.diagnostics.listing_failure(str(element), e)
+            return None
 
     def _parse_dates_list(self, date_str: str) -> List[datetime]:
         """
@@ -143,8 +577,9 @@ class BachtrackScraper:
                     # Remember the month and year for subsequent dates
                     month = dt.month
                     year = dt.year
-            except (ValueError, AttributeError):
+            except (ValueError, AttributeError) as e:
                 # Skip dates that can't be parsed
+                self.diagnostics.date_failure(part, date_str, e)
                 continue
         
         return parsed_dates
@@ -263,23 +698,98 @@ class BachtrackScraper:
         date_str = ' '.join(date_str.split())
         return datetime.strptime(date_str, '%A %d %B %Y')
 
-    def get_event_details(self, detail_url: str) -> Dict:
+    def get_event_details(self, detail_url: str, venue: Optional[str] = None, city: Optional[str] = None) -> Dict:
         """
         Fetch additional event details from event detail page.
         
+        Parsed pages are cached by URL, and pages that returned 404 are
+        remembered for a while so they are not fetched again.
+        
         Args:
             detail_url: URL of event detail page
+            venue: Venue name of the event; when given, the address is also
+                cached for the venue
+            city: City of the event, used with venue as the venue cache key
             
         Returns:
             Dictionary with address and additional metadata
         """
+        cached = self.detail_cache.get(detail_url)
+        if cached is not None:
+            return dict(cached)
+        
+        missing = self.missing_details.get(detail_url)
+        if missing is not None:
+            raise RuntimeError(f"Failed to fetch event details: {missing}")
+        
         try:
-            response = requests.get(detail_url, headers=self.headers, timeout=10)
+            response = self._fetch(detail_url, 'detail', headers=self.headers)
             response.raise_for_status()
         except requests.RequestException as e:
+            if e.response is not None and e.response.status_code == 404:
+                self.missing_details.set(detail_url, str(e))
             raise RuntimeError(f"Failed to fetch event details: {e}")
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+        start = time.monotonic()
+        details = self._parse_event_details(response.content)
+        self.diagnostics.parse(detail_url, len(response.content), time.monotonic() - start)
+        self.detail_cache.set(detail_url, details)
+        if venue and 'address' in details:
+            self.venue_cache.set(self._venue_key(venue, city), details['address'])
+        return dict(details)
+
+    def get_venue_address(self, venue: str, city: Optional[str] = None, detail_url: Optional[str] = None) -> Optional[str]:
+        """
+        Return a venue address, fetching a detail page only on a venue cache miss.
+        
+        Args:
+            venue: Venue name
+            city: City of the venue
+            detail_url: Detail page of any event at the venue, used on a miss
+            
+        Returns:
+            Venue address, or None if unknown
+        """
+        address = self.venue_cache.get(self._venue_key(venue, city))
+        if address is not None or not detail_url:
+            return address
+        return self.get_event_details(detail_url, venue=venue, city=city).get('address')
+
+    def enrich_events(self, events: List[Dict]) -> List[Dict]:
+        """
+        Add the venue address to each event, served from the venue and detail caches.
+        
+        Args:
+            events: Event dictionaries as returned by search_operas
+            
+        Returns:
+            The same events, each with an ``address`` key (None if unavailable)
+        """
+        for event in events:
+            try:
+                event['address'] = self.get_venue_address(
+                    event['venue'], city=event.get('city'), detail_url=event.get('detail_url')
+                )
+            except RuntimeError:
+                event['address'] = None
+        return events
+
+    @staticmethod
+    def _venue_key(venue: str, city: Optional[str]) -> str:
+        """Cache key for a venue."""
+        return f"{WorkResolver.normalize(city or '')}|{WorkResolver.normalize(venue)}"
+
+    def _parse_event_details(self, content: bytes) -> Dict:
+        """
+        Parse address and table rows from a detail page, building only those subtrees.
+        
+        Args:
+            content: Raw HTML of the detail page
+            
+        Returns:
+            Dictionary with address and additional metadata
+        """
+        soup = BeautifulSoup(content, 'html.parser', parse_only=self.DETAIL_STRAINER)
         
         details = {}
         
@@ -300,3 +810,49 @@ class BachtrackScraper:
                     details[key.lower()] = value
         
         return details
+
+
+_worker_state = threading.local()
+
+
+def _worker_scraper() -> BachtrackScraper:
+    """Scraper of the current worker thread, so concurrent parses never share a diagnostic log."""
+    scraper = getattr(_worker_state, 'scraper', None)
+    if scraper is None:
+        scraper = _worker_state.scraper = BachtrackScraper()
+    return scraper
+
+
+def parse_search_page(content: bytes) -> List[Listing]:
+    """
+    Parse a search results page into compact listings.
+    
+    Module-level counterpart of BachtrackScraper.parse_search_page so the
+    work can be shipped to a worker process.
+    
+    Args:
+        content: Raw HTML of the search results page
+        
+    Returns:
+        List of Listing tuples
+    """
+    return _worker_scraper().parse_search_page(content)
+
+
+def parse_search_page_with_failures(content: bytes) -> Tuple[List[Listing], List[Dict]]:
+    """
+    Parse a search results page, also returning the parse failures it logged.
+    
+    Used by ParsePool so failures in worker processes reach the caller's
+    DiagnosticLog.
+    
+    Args:
+        content: Raw HTML of the search results page
+        
+    Returns:
+        Tuple of (Listing tuples, diagnostic entries of the failures, oldest first)
+    """
+    scraper = _worker_scraper()
+    scraper.diagnostics.clear()
+    listings = scraper.parse_search_page(content)
+    return listings, scraper.diagnostics.entries()[::-1]
@@ -0,0 +1,114 @@
+"""Snapshots of the scraper caches for warm restarts."""
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+import json
+import logging
+import os
+import tempfile
+import zlib
+
+from .scraper import BachtrackScraper
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b'BTSNAP'
+SNAPSHOT_VERSION = 2
+SNAPSHOT_HEADER = SNAPSHOT_MAGIC + str(SNAPSHOT_VERSION).encode('ascii') + b'\n'
+CACHE_NAMES = ('search_cache', 'detail_cache', 'missing_details', 'venue_cache')
+
+
+def save_snapshot(scraper: BachtrackScraper, path: str) -> Dict[str, int]:
+    """
+    Write the scraper's unexpired cache entries to a compressed JSON file.
+
+    The file starts with SNAPSHOT_HEADER, which carries the format version;
+    datetimes are stored as ISO 8601 strings tagged ``{"$datetime": ...}``.
+
+    The file is written to a unique temporary file next to path and moved
+    into place, so neither a crash nor several processes saving at once
+    leave a truncated snapshot behind.
+
+    Args:
+        scraper: Scraper whose caches are saved
+        path: Snapshot file
+
+    Returns:
+        Number of entries saved per cache
+
+    Raises:
+        OSError: If the snapshot cannot be written
+    """
+    caches = {name: getattr(scraper, name).dump() for name in CACHE_NAMES}
+    payload = zlib.compress(json.dumps(caches, default=_encode_value, separators=(',', ':')).encode('utf-8'), 1)
+
+    # A temporary file of its own, so processes saving at once never share one
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix='.tmp', dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(SNAPSHOT_HEADER)
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return {name: len(entries) for name, entries in caches.items()}
+
+
+def load_snapshot(scraper: BachtrackScraper, path: str) -> Dict[str, int]:
+    """
+    Load a snapshot into the scraper's caches, keeping each entry's original expiry.
+
+    Entries that expired while the process was down are skipped, so they are
+    fetched again on first use. A missing snapshot, or one from another
+    version, loads nothing; so does an unreadable or malformed one, which is
+    logged.
+
+    Args:
+        scraper: Scraper whose caches are filled
+        path: Snapshot file
+
+    Returns:
+        Number of entries loaded per cache
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.readline(len(SNAPSHOT_HEADER)) != SNAPSHOT_HEADER:
+                return {}
+            caches = _decode_caches(f.read())
+        return {name: getattr(scraper, name).load(entries) for name, entries in caches.items()}
+    except FileNotFoundError:
+        return {}
+    except Exception:
+        logger.exception("Loading the cache snapshot from %s failed", path)
+        return {}
+
+
+def _decode_caches(payload: bytes) -> Dict[str, List[Tuple[str, Any, float]]]:
+    """Decode a snapshot payload, checking every entry's shape before anything is loaded."""
+    data = json.loads(zlib.decompress(payload), object_hook=_decode_value)
+    if not isinstance(data, dict):
+        raise ValueError("Snapshot is not a mapping of caches")
+    caches = {}
+    for name, entries in data.items():
+        if name not in CACHE_NAMES:
+            continue
+        caches[name] = []
+        for entry in entries:
+            key, value, expires_at = entry
+            if not isinstance(key, str):
+                raise ValueError(f"Invalid key in {name}: {key!r}")
+            caches[name].append((key, value, float(expires_at)))
+    return caches
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    raise TypeError(f"Cannot snapshot {type(value).__name__} values")
+
+
+def _decode_value(value: Dict) -> Any:
+    if value.keys() == {'$datetime'}:
+        return datetime.fromisoformat(value['$datetime'])
+    return value
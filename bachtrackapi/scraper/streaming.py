@@ -0,0 +1,103 @@
+"""Incremental extraction of search listings while a page downloads."""
+from html.parser import HTMLParser
+from typing import List, Optional
+
+
+# Elements that never have an end tag and so are never open
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr',
+])
+
+
+class ListingStreamParser(HTMLParser):
+    """
+    Event-driven parser that cuts ``<li data-type="nothing">`` listings out of a page fed in chunks.
+
+    Only the markup of the listing currently open is buffered; everything
+    outside listings is discarded as it streams past. Completed listings are
+    returned as HTML fragments by pop_listings.
+
+    ``</li>`` may be omitted, as HTML allows: a listing also ends when the
+    next ``<li>`` of its list starts, when an element enclosing it closes,
+    or when the parser is closed. Only the names of the open elements are
+    kept for the rest of the page.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self._buffer: List[str] = []
+        self._open: List[str] = []
+        # Index in _open of the listing being buffered
+        self._listing_at: Optional[int] = None
+        self._completed: List[str] = []
+
+    def pop_listings(self) -> List[str]:
+        """Return the listings completed since the last call, as HTML fragments."""
+        completed, self._completed = self._completed, []
+        return completed
+
+    def close(self):
+        """Finish parsing, emitting a listing left open at the end of the page."""
+        super().close()
+        if self._listing_at is not None:
+            self._finish()
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'li':
+            self._close_open_item()
+        if tag == 'li' and ('data-type', 'nothing') in attrs:
+            if self._listing_at is not None:
+                self._finish()
+            self._buffer = [self.get_starttag_text()]
+            self._listing_at = len(self._open)
+        elif self._listing_at is not None:
+            self._buffer.append(self.get_starttag_text())
+        if tag not in VOID_ELEMENTS:
+            self._open.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if self._listing_at is not None:
+            self._buffer.append(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if tag not in self._open:
+            # Stray end tag
+            return
+        index = len(self._open) - 1 - self._open[::-1].index(tag)
+        if self._listing_at is not None:
+            if index == self._listing_at:
+                self._buffer.append(f'</{tag}>')
+            if index <= self._listing_at:
+                # The listing itself, or an element enclosing it, closed
+                self._finish()
+            else:
+                self._buffer.append(f'</{tag}>')
+        del self._open[index:]
+
+    def handle_data(self, data):
+        if self._listing_at is not None:
+            self._buffer.append(data)
+
+    def handle_entityref(self, name):
+        if self._listing_at is not None:
+            self._buffer.append(f'&{name};')
+
+    def handle_charref(self, name):
+        if self._listing_at is not None:
+            self._buffer.append(f'&#{name};')
+
+    def _close_open_item(self) -> None:
+        """Implicitly close the open ``<li>`` of the current list, as a new ``<li>`` starts."""
+        for index in range(len(self._open) - 1, -1, -1):
+            if self._open[index] in ('ul', 'ol'):
+                return
+            if self._open[index] == 'li':
+                if self._listing_at is not None and index <= self._listing_at:
+                    self._finish()
+                del self._open[index:]
+                return
+
+    def _finish(self) -> None:
+        self._completed.append(''.join(self._buffer))
+        self._buffer = []
+        self._listing_at = None
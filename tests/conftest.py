@@ -0,0 +1,82 @@
+"""Shared fixtures: canned Bachtrack pages served instead of live requests."""
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+
+def listing_html(*listings) -> bytes:
+    """Build a search results page from (title, city, venue, dates, href) tuples."""
+    items = "".join(
+        f"""
+        <li data-type="nothing">
+          <div class="listing-ms-main">{title} Wish list</div>
+          <div class="listing-ms-city">{city}</div>
+          <div class="listing-ms-venue">{venue}</div>
+          <div class="listing-ms-dates">{dates}</div>
+          <a class="listing-ms-right" href="{href}">More</a>
+        </li>"""
+        for title, city, venue, dates, href in listings
+    )
+    return f"<html><body><ul>{items}</ul></body></html>".encode()
+
+
+SCHICCHI_HTML = listing_html(
+    ("Gianni Schicchi", "Berlin", "Deutsche Oper", "Apr 05, 10", "/opera-event/gianni-schicchi-berlin/428220"),
+    ("Gianni Schicchi", "Winterthur", "Stadttheater", "Sun 3 May at 14:00", "/opera-event/gianni-schicchi-winterthur/428221"),
+)
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    encoding = "utf-8"
+
+    def __init__(self, content=b"", status_code=200, headers=None, encoding=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers if headers is not None else {"Content-Type": "text/html; charset=utf-8"}
+        if encoding is not None:
+            self.encoding = encoding
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """
+    Serve pages from a URL -> HTML dict instead of bachtrack.com.
+
+    Both requests.get and Session.get are patched. Unknown URLs answer 404.
+    The fixture value is the dict of pages; fetched URLs are recorded in its
+    ``calls`` attribute.
+    """
+    class Pages(dict):
+        calls = []
+
+    pages = Pages()
+    pages.calls = []
+
+    def fake_get(url, **kwargs):
+        pages.calls.append(url)
+        if url in pages:
+            return FakeResponse(pages[url])
+        return FakeResponse(status_code=404)
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    monkeypatch.setattr(requests.Session, "get", lambda session, url, **kwargs: fake_get(url, **kwargs))
+    return pages
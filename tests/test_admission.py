@@ -0,0 +1,80 @@
+"""Test admission control and load shedding."""
+import asyncio
+import sys
+from pathlib import Path
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+
+from backend.config import settings
+from backend.main import create_app
+from backend.routes import events
+from backend.services.admission import AdmissionController, AdmissionRejected
+from tests.conftest import SCHICCHI_HTML
+
+
+def test_queue_limits_and_deadline():
+    """Requests beyond the limit queue briefly, then get shed with a status and Retry-After."""
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_per_client=1, max_queue=1, queue_timeout=0.1)
+        async with controller.admit("a"):
+            with pytest.raises(AdmissionRejected) as per_client:
+                async with controller.admit("a"):
+                    pass
+            assert per_client.value.status_code == 429
+
+            waiter = asyncio.ensure_future(_enter(controller, "b"))
+            await asyncio.sleep(0)
+            with pytest.raises(AdmissionRejected) as queue_full:
+                async with controller.admit("c"):
+                    pass
+            assert queue_full.value.status_code == 503
+
+            with pytest.raises(AdmissionRejected) as deadline:
+                await waiter
+            assert deadline.value.retry_after == 1
+
+        async with controller.admit("b"):
+            assert controller.stats() == {"waiting": 0, "clients": 1}
+
+    asyncio.run(scenario())
+
+
+async def _enter(controller, client):
+    async with controller.admit(client):
+        pass
+
+
+def test_cached_searches_skip_admission(upstream, monkeypatch):
+    """With no slots to spare, uncached searches are shed but cached ones are served."""
+    events.service.scraper.search_cache.clear()
+    upstream["https://bachtrack.com/search-opera/work=12285"] = SCHICCHI_HTML
+    client = TestClient(create_app())
+    assert client.get("/api/v1/events/search?work_id=12285").status_code == 200
+
+    monkeypatch.setattr(events.admission, "max_per_client", 0)
+    assert client.get("/api/v1/events/search?work_id=12285").status_code == 200
+    response = client.get("/api/v1/events/search?q=tosca")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "1"
+    assert client.get("/health").status_code == 200
+
+
+def _request(peer, forwarded=None):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "client": (peer, 1234), "headers": headers})
+
+
+def test_forwarded_for_needs_trusted_proxy(monkeypatch):
+    """X-Forwarded-For is ignored unless the connection comes from a trusted proxy."""
+    monkeypatch.setattr(settings, "trusted_proxies", None)
+    assert events._client_key(_request("203.0.113.5", "198.51.100.1")) == "203.0.113.5"
+
+    monkeypatch.setattr(settings, "trusted_proxies", "10.0.0.1, 10.0.0.2")
+    assert events._client_key(_request("203.0.113.5", "198.51.100.1")) == "203.0.113.5"
+    assert events._client_key(_request("10.0.0.1", "spoofed, 198.51.100.1, 10.0.0.2")) == "198.51.100.1"
+    assert events._client_key(_request("10.0.0.1")) == "10.0.0.1"
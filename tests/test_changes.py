@@ -0,0 +1,71 @@
+"""Test the change feed between successive crawls."""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import create_app
+from backend.routes import events
+from backend.services.changes import ChangeLog, ChangelogExpiredError
+from tests.conftest import SCHICCHI_HTML, listing_html
+
+
+WORK_URL = "https://bachtrack.com/search-opera/work=12285"
+
+
+def test_changes_endpoint(upstream):
+    """A recrawl reports added, removed and rescheduled performances."""
+    service = events.service
+    service.scraper.search_cache.clear()
+    client = TestClient(create_app())
+    token = client.get("/api/v1/events/changes").json()["token"]
+
+    upstream[WORK_URL] = SCHICCHI_HTML
+    client.get("/api/v1/events/search?work_id=12285")
+
+    # Berlin Apr 10 moves to Apr 12, Winterthur drops out, Vienna is new
+    service.scraper.search_cache.clear()
+    upstream[WORK_URL] = listing_html(
+        ("Gianni Schicchi", "Berlin", "Deutsche Oper", "Apr 05, 12", "/opera-event/gianni-schicchi-berlin/428220"),
+        ("Gianni Schicchi", "Vienna", "Staatsoper", "Jun 01", "/opera-event/gianni-schicchi-vienna/7"),
+    )
+    client.get("/api/v1/events/search?work_id=12285")
+
+    data = client.get("/api/v1/events/changes", params={"since": token, "work_id": 12285}).json()
+    changes = {change["change"]: change for change in data["changes"]}
+    assert sorted(changes) == ["added", "removed", "rescheduled"]
+    assert changes["added"]["event"]["city"] == "Vienna"
+    assert changes["removed"]["event"]["city"] == "Winterthur"
+    assert changes["rescheduled"]["event"]["date"].endswith("-04-12T00:00:00")
+    assert changes["rescheduled"]["previous_date"].endswith("-04-10T00:00:00")
+
+    assert client.get("/api/v1/events/changes", params={"since": data["token"]}).json()["changes"] == []
+
+
+def test_changelog_is_bounded():
+    """Tokens older than the retained changes are rejected."""
+    log = ChangeLog(max_changes=1)
+    log.record("q", [])
+    log.record("q", [{"detail_url": "a", "date": "2026-01-01"}])
+    log.record("q", [{"detail_url": "b", "date": "2026-01-01"}])
+    with pytest.raises(ChangelogExpiredError):
+        log.since("0")
+    changes, token = log.since("2")
+    assert [change["seq"] for change in changes] == [3]
+
+
+def test_baselines_are_bounded():
+    """Only the most recently crawled queries keep a baseline to diff against."""
+    log = ChangeLog(max_queries=2)
+    event = {"title": "Tosca", "city": "Berlin", "venue": "Deutsche Oper", "date": datetime(2025, 4, 5), "detail_url": "x"}
+    for query in ("a", "b", "c"):
+        log.record(query, [])
+    assert len(log._snapshots) == 2
+    # "a" lost its baseline, so its next crawl only records a new one
+    assert log.record("a", [event]) == []
+    assert [record["change"] for record in log.record("c", [event])] == ["added"]
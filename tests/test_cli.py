@@ -0,0 +1,51 @@
+"""Test the bulk crawl command line interface."""
+import json
+import sys
+from pathlib import Path
+
+# Ensure the repository root is importable for the `bachtrackapi` package.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bachtrackapi.cli import main
+from tests.conftest import SCHICCHI_HTML, listing_html
+
+
+def test_crawl_streams_and_resumes(upstream, tmp_path):
+    """An interrupted crawl resumes without refetching or duplicating events."""
+    upstream["https://bachtrack.com/search-opera/work=12285"] = SCHICCHI_HTML
+    upstream["https://bachtrack.com/search-opera/freetext=tosca"] = listing_html(
+        ("Tosca", "Vienna", "Staatsoper", "May 02", "/opera-event/tosca-vienna/1"),
+    )
+    queries = tmp_path / "queries.txt"
+    output = tmp_path / "events.jsonl"
+
+    # First run: one query fails upstream
+    queries.write_text("12285\n# comment\n\nmissing work\n")
+    assert main(["crawl", str(queries), "-o", str(output), "--rate", "0"]) == 1
+    assert len(output.read_text().splitlines()) == 3
+
+    # Second run: only the new and the failed queries are fetched
+    upstream.calls.clear()
+    queries.write_text("12285\nmissing work\nTosca\n")
+    main(["crawl", str(queries), "-o", str(output), "--rate", "0"])
+    assert sorted(upstream.calls) == [
+        "https://bachtrack.com/search-opera/freetext=missing%20work",
+        "https://bachtrack.com/search-opera/freetext=tosca",
+    ]
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [record["query"] for record in records] == ["12285"] * 3 + ["Tosca"]
+    assert records[0]["date"].endswith("T00:00:00")
+
+
+def test_crawl_distinct_productions(upstream, tmp_path):
+    """With --distinct, a production found by two queries is written once."""
+    upstream["https://bachtrack.com/search-opera/work=12285"] = SCHICCHI_HTML
+    upstream["https://bachtrack.com/search-opera/freetext=puccini"] = SCHICCHI_HTML
+    queries = tmp_path / "queries.txt"
+    queries.write_text("12285\npuccini\n")
+    output = tmp_path / "events.jsonl"
+
+    main(["crawl", str(queries), "-o", str(output), "--rate", "0", "--concurrency", "1", "--distinct", "productions"])
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [record["city"] for record in records] == ["Berlin", "Winterthur"]
@@ -0,0 +1,56 @@
+"""Test the concurrent sync API of the scraper."""
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+import requests
+
+from scraper.scraper import BachtrackScraper
+from tests.conftest import FakeResponse, SCHICCHI_HTML
+
+
+WORK_URL = "https://bachtrack.com/search-opera/work={}"
+
+
+def test_map_search_in_order_with_errors(upstream):
+    """Results come back in input order, with failed searches carrying their error."""
+    for work_id in (1, 2, 3):
+        upstream[WORK_URL.format(work_id)] = SCHICCHI_HTML
+    scraper = BachtrackScraper(max_workers=4)
+
+    results = list(scraper.map_search([3, 404, 1, 2], max_workers=2))
+    scraper.close()
+    assert [result.item for result in results] == [3, 404, 1, 2]
+    assert [len(result.value) if result.value else None for result in results] == [3, None, 3, 3]
+    assert isinstance(results[1].error, RuntimeError)
+    assert all(result.error is None for result in results if result.item != 404)
+
+
+def test_map_details_runs_concurrently(monkeypatch):
+    """Detail pages are fetched in parallel, and as_completed order follows completion."""
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_get(session, url, **kwargs):
+        with lock:
+            active.append(url)
+            peak.append(len(active))
+        time.sleep(0.2 if url.endswith("slow") else 0.05)
+        with lock:
+            active.remove(url)
+        return FakeResponse(b'<span class="listing-address">' + url.encode() + b"</span>")
+
+    monkeypatch.setattr(requests.Session, "get", fake_get)
+    scraper = BachtrackScraper()
+    urls = ["https://bachtrack.com/slow", "https://bachtrack.com/a", "https://bachtrack.com/b"]
+
+    results = list(scraper.map_details(urls, ordered=False))
+    scraper.close()
+    assert max(peak) == 3
+    assert results[-1].item == "https://bachtrack.com/slow"
+    assert {result.item: result.value["address"] for result in results} == {url: url for url in urls}
@@ -0,0 +1,59 @@
+"""Test cross-query event deduplication."""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+from fastapi.testclient import TestClient
+
+from backend.main import create_app
+from backend.routes import events
+from scraper.dedup import EventIndex
+from tests.conftest import SCHICCHI_HTML, listing_html
+
+
+BERLIN = "https://bachtrack.com/opera-event/gianni-schicchi-berlin/428220"
+
+
+def event(day, detail_url=BERLIN):
+    return {"title": "Gianni Schicchi", "city": "Berlin", "venue": "Deutsche Oper",
+            "date": datetime(2026, 4, day), "detail_url": detail_url}
+
+
+def test_event_index():
+    """Performances are keyed by detail URL and date; productions by detail URL."""
+    index = EventIndex()
+    assert index.extend([event(5), event(10)]) == [event(5), event(10)]
+    assert index.extend([event(10), event(15), event(5, BERLIN + "1")]) == [event(15), event(5, BERLIN + "1")]
+    assert len(index) == 4
+    assert event(15) in index
+    assert index.productions() == [event(5), event(5, BERLIN + "1")]
+
+
+def test_batch_search_merges_duplicates(upstream):
+    """The same production found by a work ID and a freetext search is returned once."""
+    events.service.scraper.search_cache.clear()
+    upstream["https://bachtrack.com/search-opera/work=12285"] = SCHICCHI_HTML
+    upstream["https://bachtrack.com/search-opera/freetext=il%20trittico"] = listing_html(
+        ("Il trittico", "Berlin", "Deutsche Oper", "Apr 05, 10", "/opera-event/gianni-schicchi-berlin/428220"),
+        ("Il trittico", "Paris", "Opéra Bastille", "Jun 01", "/opera-event/il-trittico-paris/5"),
+    )
+    client = TestClient(create_app())
+
+    response = client.post("/api/v1/events/search/batch", json={"queries": [12285, "Il trittico"]})
+    assert response.status_code == 200
+    assert response.json()["total_results"] == 4
+
+    response = client.post("/api/v1/events/search/batch", json={"queries": [12285, "Il trittico"], "distinct": "productions"})
+    assert [result["city"] for result in response.json()["results"]] == ["Berlin", "Winterthur", "Paris"]
+
+
+def test_batch_search_validates_each_query(upstream):
+    """Each query is held to the same limits as a single search."""
+    client = TestClient(create_app())
+    for query in (0, -5, "", "x" * 201):
+        response = client.post("/api/v1/events/search/batch", json={"queries": [12285, query]})
+        assert response.status_code == 422
+    assert upstream.calls == []
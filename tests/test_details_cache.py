@@ -0,0 +1,60 @@
+"""Test caching of event detail pages and venue addresses."""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+from scraper.scraper import BachtrackScraper
+
+
+DETAIL_URL = "https://bachtrack.com/opera-event/gianni-schicchi-deutsche-oper-berlin/428220"
+DETAIL_HTML = b"""
+<html><body>
+  <span class="listing-address">Bismarckstrasse 35, Berlin</span>
+  <table><tbody class="plassmap_table">
+    <tr><td>Phone</td><td>+49 30 34384343</td></tr>
+  </tbody></table>
+</body></html>
+"""
+
+
+@pytest.fixture
+def fetches(upstream):
+    """Serve the detail page and return the list of fetched URLs."""
+    upstream[DETAIL_URL] = DETAIL_HTML
+    return upstream.calls
+
+
+def test_detail_page_cached(fetches):
+    """A detail page is fetched once and then served from memory."""
+    scraper = BachtrackScraper()
+    first = scraper.get_event_details(DETAIL_URL, venue="Deutsche Oper", city="Berlin")
+    second = scraper.get_event_details(DETAIL_URL)
+    assert first == second == {"address": "Bismarckstrasse 35, Berlin", "phone": "+49 30 34384343"}
+    assert fetches == [DETAIL_URL]
+    assert scraper.get_venue_address("Deutsche  Oper", city="berlin") == "Bismarckstrasse 35, Berlin"
+
+
+def test_missing_detail_page_cached(fetches):
+    """A 404 is remembered and not fetched again."""
+    scraper = BachtrackScraper()
+    missing = "https://bachtrack.com/opera-event/gone/1"
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            scraper.get_event_details(missing)
+    assert fetches == [missing]
+
+
+def test_enrich_events(fetches):
+    """Events at the same venue share one detail fetch."""
+    scraper = BachtrackScraper()
+    events = [
+        {"title": "Gianni Schicchi", "city": "Berlin", "venue": "Deutsche Oper", "detail_url": DETAIL_URL},
+        {"title": "Tosca", "city": "Berlin", "venue": "Deutsche Oper", "detail_url": DETAIL_URL + "1"},
+    ]
+    scraper.enrich_events(events)
+    assert [event["address"] for event in events] == ["Bismarckstrasse 35, Berlin"] * 2
+    assert fetches == [DETAIL_URL]
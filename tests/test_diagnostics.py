@@ -0,0 +1,110 @@
+"""Test the diagnostic log of slow operations and parse failures."""
+import sys
+import time
+from pathlib import Path
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+import requests
+from fastapi.testclient import TestClient
+
+from backend.config import settings
+from backend.main import create_app
+from backend.routes import events
+from scraper.diagnostics import DiagnosticLog
+from scraper.pool import ParsePool
+from scraper.scraper import BachtrackScraper
+from tests.conftest import FakeResponse, SCHICCHI_HTML, listing_html
+
+
+WORK_URL = "https://bachtrack.com/search-opera/work=12285"
+
+BROKEN_HTML = listing_html(
+    ("Gianni Schicchi", "Berlin", "Deutsche Oper", "Apr 05, Sometime, 10", "/opera-event/gianni-schicchi-berlin/428220"),
+) + b'<ul><li data-type="nothing"><div class="listing-ms-city">Lyon</div></li></ul>'
+
+
+def test_parse_failures_are_sampled(upstream):
+    """Dropped listings and dates are counted and logged with their markup."""
+    upstream[WORK_URL] = BROKEN_HTML
+    scraper = BachtrackScraper()
+
+    assert len(scraper.search_operas(12285)) == 2
+    counts = scraper.diagnostics.counts()
+    assert counts["listing_failure"] == 1 and counts["date_failure"] == 1
+    [date_failure] = scraper.diagnostics.entries(kind="date_failure")
+    assert date_failure["part"] == "Sometime"
+    assert date_failure["sample"] == "Apr 05, Sometime, 10"
+    [listing_failure] = scraper.diagnostics.entries(kind="listing_failure")
+    assert "Lyon" in listing_failure["sample"]
+
+
+def test_log_is_bounded():
+    """Old entries rotate out while the counters keep the totals."""
+    log = DiagnosticLog(max_entries=2, slow_fetch=1.0)
+    for seconds in (0.5, 1.5, 2.5, 3.5):
+        log.fetch("https://bachtrack.com/x", "search", seconds)
+    assert [entry["seconds"] for entry in log.entries()] == [3.5, 2.5]
+    assert log.counts()["slow_fetch"] == 3
+
+
+def test_admin_endpoint(upstream, monkeypatch):
+    """The admin endpoint serves counters and entries, filtered by kind."""
+    monkeypatch.setattr(events.service.scraper, "diagnostics", DiagnosticLog(slow_fetch=0))
+    monkeypatch.setattr(settings, "admin_token", "s3cret")
+    events.service.scraper.search_cache.clear()
+    upstream[WORK_URL] = BROKEN_HTML
+    client = TestClient(create_app())
+    client.get("/api/v1/events/search?work_id=12285")
+    auth = {"Authorization": "Bearer s3cret"}
+
+    body = client.get("/admin/diagnostics?kind=slow_fetch", headers=auth).json()
+    assert body["counts"]["slow_fetch"] == 1
+    assert [entry["url"] for entry in body["entries"]] == [WORK_URL]
+    assert client.get("/admin/diagnostics?kind=nope", headers=auth).status_code == 400
+
+
+def test_admin_endpoint_is_protected(monkeypatch):
+    """The endpoint is off without an admin token and rejects requests without it."""
+    client = TestClient(create_app())
+    monkeypatch.setattr(settings, "admin_token", None)
+    assert client.get("/admin/diagnostics", headers={"Authorization": "Bearer "}).status_code == 404
+
+    monkeypatch.setattr(settings, "admin_token", "s3cret")
+    assert client.get("/admin/diagnostics").status_code == 401
+    assert client.get("/admin/diagnostics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+
+def test_pool_worker_failures_reach_the_parent(upstream):
+    """Failures in ParsePool workers are logged by the scraper that submitted the page."""
+    upstream[WORK_URL] = BROKEN_HTML
+    with ParsePool(max_workers=1, inline_threshold=0) as pool:
+        scraper = BachtrackScraper(parse_pool=pool)
+        assert len(scraper.search_operas(12285)) == 2
+    counts = scraper.diagnostics.counts()
+    assert counts["listing_failure"] == 1 and counts["date_failure"] == 1
+    assert [entry["part"] for entry in scraper.diagnostics.entries(kind="date_failure")] == ["Sometime"]
+
+
+def test_incremental_search_logs_download_and_parse_time(monkeypatch):
+    """A streamed search is timed over the whole body download and all listing parses."""
+    def slow_chunks(chunk_size=1):
+        for start in range(0, len(SCHICCHI_HTML), chunk_size):
+            time.sleep(0.01)
+            yield SCHICCHI_HTML[start:start + chunk_size]
+
+    response = FakeResponse(SCHICCHI_HTML)
+    response.iter_content = slow_chunks
+    monkeypatch.setattr(requests.Session, "get", lambda session, url, **kwargs: response)
+    scraper = BachtrackScraper(incremental=True, diagnostics=DiagnosticLog(slow_fetch=0.05, slow_parse=0))
+
+    events = scraper.iter_search(12285, chunk_size=len(SCHICCHI_HTML) // 8)
+    next(events)
+    time.sleep(0.2)
+    list(events)
+
+    [fetch] = scraper.diagnostics.entries(kind="slow_fetch")
+    assert 0.05 <= fetch["seconds"] < 0.2
+    [parse] = scraper.diagnostics.entries(kind="slow_parse")
+    assert parse["bytes"] == len(SCHICCHI_HTML)
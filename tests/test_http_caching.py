@@ -0,0 +1,70 @@
+"""Test response compression, ETags and Cache-Control on the API."""
+import sys
+from pathlib import Path
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+from fastapi.testclient import TestClient
+
+from backend.main import create_app
+from backend.routes import events
+from tests.conftest import SCHICCHI_HTML, listing_html
+
+
+WORK_URL = "https://bachtrack.com/search-opera/work=12285"
+
+
+def test_etag_and_not_modified(upstream):
+    """Repeat queries with If-None-Match get a 304 and no body."""
+    events.service.scraper.search_cache.clear()
+    upstream[WORK_URL] = SCHICCHI_HTML
+    client = TestClient(create_app())
+
+    response = client.get("/api/v1/events/search?work_id=12285")
+    assert response.status_code == 200
+    assert response.json()["total_results"] == 3
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"].startswith("public, max-age=")
+
+    response = client.get("/api/v1/events/search?work_id=12285", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert len(upstream.calls) == 1
+
+
+def test_gzip_threshold(upstream):
+    """Large payloads are gzip-compressed, tiny ones are not."""
+    events.service.scraper.search_cache.clear()
+    upstream[WORK_URL] = listing_html(
+        *[("Gianni Schicchi", "Berlin", "Deutsche Oper", "Apr 05, 10, 15, 17", f"/opera-event/x/{i}") for i in range(20)]
+    )
+    client = TestClient(create_app())
+
+    response = client.get("/api/v1/events/get_operas?q=12285", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 80
+
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_compressed_responses_get_their_own_etag(upstream):
+    """Gzip and identity responses carry different strong ETags, and both revalidate."""
+    events.service.scraper.search_cache.clear()
+    upstream[WORK_URL] = listing_html(
+        *[("Gianni Schicchi", "Berlin", "Deutsche Oper", "Apr 05, 10, 15, 17", f"/opera-event/x/{i}") for i in range(20)]
+    )
+    client = TestClient(create_app())
+    url = "/api/v1/events/get_operas?q=12285"
+
+    gzipped = client.get(url, headers={"Accept-Encoding": "gzip"})
+    identity = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in identity.headers
+    assert gzipped.headers["etag"] == identity.headers["etag"][:-1] + '-gzip"'
+
+    for etag, encoding in ((gzipped.headers["etag"], "gzip"), (identity.headers["etag"], "identity")):
+        response = client.get(url, headers={"Accept-Encoding": encoding, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
@@ -0,0 +1,92 @@
+"""Test adaptive timeouts and hedged upstream requests."""
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+import pytest
+import requests
+
+from scraper.latency import UpstreamFetcher
+from tests.conftest import FakeResponse
+
+
+def test_timeout_follows_p99():
+    """The timeout starts at the maximum and then tracks observed latency."""
+    fetcher = UpstreamFetcher(max_timeout=10, min_timeout=0.5, timeout_multiplier=3)
+    assert fetcher.timeout("search") == 10
+    for _ in range(50):
+        fetcher.latency.record("search", 0.4)
+    assert fetcher.timeout("search") == pytest.approx(1.2)
+    assert fetcher.timeout("detail") == 10
+
+
+def test_hedge_wins_over_stuck_request(monkeypatch):
+    """A fetch stuck past p95 is duplicated and the faster response is used."""
+    calls = []
+
+    def fake_get(url, timeout=None, **kwargs):
+        calls.append(timeout)
+        if len(calls) == 1:
+            time.sleep(0.5)
+            return FakeResponse(b"slow")
+        return FakeResponse(b"fast")
+
+    monkeypatch.setattr(requests.Session, "get", lambda session, url, **kwargs: fake_get(url, **kwargs))
+    fetcher = UpstreamFetcher(hedging=True, hedge_budget=1.0)
+    for _ in range(20):
+        fetcher.latency.record("search", 0.01)
+
+    start = time.monotonic()
+    assert fetcher.get("https://bachtrack.com/x", "search").content == b"fast"
+    assert time.monotonic() - start < 0.4
+
+    metrics = fetcher.metrics()
+    assert metrics["hedges_fired"] == metrics["hedges_won"] == 1
+    assert metrics["endpoints"]["search"]["p50"] is not None
+
+
+def test_timeout_recovers_when_latency_rises(monkeypatch):
+    """Timed-out fetches raise the timeout until it covers the slower upstream again."""
+    upstream_latency = 0.5
+
+    def fake_get(session, url, timeout=None, **kwargs):
+        if timeout < upstream_latency:
+            raise requests.Timeout(f"timed out after {timeout}")
+        return FakeResponse(b"ok")
+
+    monkeypatch.setattr(requests.Session, "get", fake_get)
+    fetcher = UpstreamFetcher(max_timeout=10, min_timeout=0.1, timeout_multiplier=3)
+    for _ in range(200):
+        fetcher.latency.record("search", 0.05)
+    assert fetcher.timeout("search") == pytest.approx(0.15)
+
+    for attempt in range(10):
+        try:
+            fetcher.get("https://bachtrack.com/x", "search")
+            break
+        except requests.Timeout:
+            continue
+    else:
+        pytest.fail("timeout never grew past the upstream latency")
+    assert fetcher.timeout("search") >= upstream_latency
+    assert fetcher.metrics()["timeouts"] == attempt
+
+
+def test_sessions_per_thread_share_one_pool():
+    """Every thread gets its own session, all mounted on the same connection pool."""
+    fetcher = UpstreamFetcher()
+    sessions = []
+    threads = [threading.Thread(target=lambda: sessions.append(fetcher.session())) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetcher.session() is fetcher.session()
+    assert len({id(session) for session in sessions + [fetcher.session()]}) == 4
+    assert len({id(session.get_adapter("https://bachtrack.com")) for session in sessions}) == 1
+    fetcher.close()
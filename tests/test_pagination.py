@@ -0,0 +1,82 @@
+"""Test limit/cursor pagination, sorting and field projection."""
+import sys
+from pathlib import Path
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import create_app
+from backend.routes import events
+from tests.conftest import SCHICCHI_HTML
+
+
+@pytest.fixture
+def client(upstream):
+    events.service.scraper.search_cache.clear()
+    upstream["https://bachtrack.com/search-opera/work=12285"] = SCHICCHI_HTML
+    return TestClient(create_app())
+
+
+def test_cursor_walks_all_pages(client):
+    """Following next_cursor returns every event exactly once."""
+    cities, cursor = [], None
+    while True:
+        params = {"work_id": 12285, "limit": 2, "sort": "-city"}
+        if cursor:
+            params["cursor"] = cursor
+        data = client.get("/api/v1/events/search", params=params).json()
+        assert data["total_results"] == 3
+        cities += [result["city"] for result in data["results"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert cities == ["Winterthur", "Berlin", "Berlin"]
+
+
+def test_field_projection(client):
+    """Only the requested fields are returned."""
+    data = client.get("/api/v1/events/search", params={"work_id": 12285, "fields": "city,date", "limit": 1}).json()
+    assert list(data["results"][0]) == ["city", "date"]
+
+    response = client.get("/api/v1/events/get_operas", params={"q": "12285", "fields": "venue", "limit": 1})
+    assert response.json() == [{"venue": "Deutsche Oper"}]
+    assert response.headers["x-total-count"] == "3"
+    assert response.headers["x-next-cursor"]
+
+
+def test_invalid_parameters(client):
+    """Unknown fields and cursors from another query are rejected."""
+    assert client.get("/api/v1/events/search", params={"work_id": 12285, "fields": "price"}).status_code == 400
+
+    cursor = client.get("/api/v1/events/search", params={"work_id": 12285, "limit": 1}).json()["next_cursor"]
+    response = client.get("/api/v1/events/search", params={"work_id": 12285, "limit": 1, "sort": "date", "cursor": cursor})
+    assert response.status_code == 400
+    assert client.get("/api/v1/events/search", params={"work_id": 12285, "cursor": "garbage"}).status_code == 400
+
+
+def test_cursor_survives_equivalent_spelling(client, upstream):
+    """A cursor works for any spelling of the query it was issued for."""
+    upstream[events.service.scraper.search_url("Gianni Schicchi")] = SCHICCHI_HTML
+    first = client.get("/api/v1/events/get_operas", params={"q": "Gianni Schicchi", "limit": 1})
+    response = client.get(
+        "/api/v1/events/get_operas",
+        params={"q": "gianni  schicchi", "limit": 1, "cursor": first.headers["x-next-cursor"]},
+    )
+    assert response.status_code == 200
+    assert response.json() != first.json()
+
+
+def test_cursor_expires_when_results_change(client, upstream):
+    """A cursor issued before the result changed is rejected with 410."""
+    cursor = client.get("/api/v1/events/search", params={"work_id": 12285, "limit": 1}).json()["next_cursor"]
+    url = "https://bachtrack.com/search-opera/work=12285"
+    events.service.scraper.search_cache.clear()
+    upstream[url] = SCHICCHI_HTML.replace(b"Deutsche Oper", b"Komische Oper")
+
+    response = client.get("/api/v1/events/search", params={"work_id": 12285, "limit": 1, "cursor": cursor})
+    assert response.status_code == 410
+    response = client.get("/api/v1/events/get_operas", params={"q": "12285", "limit": 1, "cursor": cursor})
+    assert response.status_code == 410
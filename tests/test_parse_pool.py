@@ -0,0 +1,35 @@
+"""Test parsing search pages in worker processes."""
+import sys
+from pathlib import Path
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+from scraper.pool import ParsePool
+from scraper.scraper import BachtrackScraper
+from tests.conftest import SCHICCHI_HTML
+
+
+def test_pool_matches_in_process_parse():
+    """Listings parsed by workers equal the in-process parse."""
+    expected = BachtrackScraper().parse_search_page(SCHICCHI_HTML)
+    assert [len(listing.dates) for listing in expected] == [2, 1]
+
+    with ParsePool(max_workers=2, inline_threshold=0) as pool:
+        futures = [pool.submit(SCHICCHI_HTML) for _ in range(4)]
+        assert all(future.result() == expected for future in futures)
+
+
+def test_small_pages_parsed_inline():
+    """Pages under the threshold never start the worker processes."""
+    pool = ParsePool(max_workers=2)
+    assert pool.parse(SCHICCHI_HTML) == BachtrackScraper().parse_search_page(SCHICCHI_HTML)
+    assert pool._executor is None
+
+
+def test_scraper_uses_pool(upstream):
+    """search_operas hands the page to the pool and expands the listings."""
+    upstream["https://bachtrack.com/search-opera/work=12285"] = SCHICCHI_HTML
+    with ParsePool(max_workers=1, inline_threshold=0) as pool:
+        events = BachtrackScraper(parse_pool=pool).search_operas(12285)
+    assert [event["city"] for event in events] == ["Berlin", "Berlin", "Winterthur"]
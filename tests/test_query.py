@@ -0,0 +1,86 @@
+"""Test structured search queries."""
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+import pytest
+
+from scraper.pool import ParsePool
+from scraper.query import OperaQuery
+from scraper.resolver import WorkResolver
+from scraper.scraper import BachtrackScraper
+from tests.conftest import SCHICCHI_HTML
+
+
+WORK_URL = "https://bachtrack.com/search-opera/work=12285"
+
+
+def test_cache_key_is_canonical():
+    """Equivalent queries share a cache key; filters are part of it."""
+    scraper = BachtrackScraper()
+    assert scraper.cache_key(12285) == WORK_URL
+    assert scraper.cache_key(OperaQuery(work_id=12285)) == WORK_URL
+    assert scraper.cache_key(OperaQuery(work_id=12285, city=" BERLIN ")) == scraper.cache_key(
+        OperaQuery(work_id=12285, city="berlin")
+    )
+    assert scraper.cache_key(OperaQuery(work_id=12285, date_from=datetime(2025, 4, 6, 19, 30))) == (
+        f"{WORK_URL}?date_from=2025-04-06"
+    )
+    with pytest.raises(ValueError):
+        scraper.search_url(OperaQuery(city="Berlin"))
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_city_filter_skips_listings(upstream, incremental):
+    """Listings in other cities are dropped and the filtered result is cached on its own."""
+    upstream[WORK_URL] = SCHICCHI_HTML
+    scraper = BachtrackScraper(incremental=incremental)
+
+    events = scraper.search_operas(OperaQuery(work_id=12285, city="winterthur"))
+    assert [event["city"] for event in events] == ["Winterthur"]
+    assert scraper.cache_key(OperaQuery(work_id=12285, city="winterthur")) in scraper.search_cache
+    assert WORK_URL not in scraper.search_cache
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_filtered_query_uses_cached_unfiltered_page(upstream, incremental):
+    """A filtered query is answered from the cached unfiltered page without refetching."""
+    upstream[WORK_URL] = SCHICCHI_HTML
+    scraper = BachtrackScraper(incremental=incremental)
+
+    assert len(scraper.search_operas(12285)) == 3
+    query = OperaQuery(work_id=12285, city="berlin")
+    assert [event["venue"] for event in scraper.search_operas(query)] == ["Deutsche Oper", "Deutsche Oper"]
+    assert upstream.calls == [WORK_URL]
+    assert scraper.search_cache.remaining(scraper.cache_key(query)) == pytest.approx(scraper.search_cache.remaining(WORK_URL), abs=1)
+
+
+def test_date_window_drops_dates_before_expansion(upstream):
+    """Only dates inside the window are expanded, and listings left without dates are dropped."""
+    upstream[WORK_URL] = SCHICCHI_HTML
+    scraper = BachtrackScraper()
+    year = datetime.now().year
+
+    events = scraper.search_operas(OperaQuery(work_id=12285, date_from=date(year, 4, 6), date_to=date(year, 4, 30)))
+    assert [(event["city"], event["date"]) for event in events] == [("Berlin", datetime(year, 4, 10))]
+
+
+def test_pool_results_are_filtered(upstream):
+    """Listings parsed in worker processes get the same filters."""
+    upstream[WORK_URL] = SCHICCHI_HTML
+    with ParsePool(max_workers=1, inline_threshold=0) as pool:
+        scraper = BachtrackScraper(parse_pool=pool)
+        events = scraper.search_operas(OperaQuery(work_id=12285, venue="deutsche"))
+    assert {event["venue"] for event in events} == {"Deutsche Oper"}
+
+
+def test_filtered_freetext_is_not_learned(upstream):
+    """A city-filtered freetext search does not teach the resolver a work mapping."""
+    url = "https://bachtrack.com/search-opera/freetext=schicchi"
+    upstream[url] = SCHICCHI_HTML.replace(b'href="/opera-event', b'href="/work=12285/opera-event')
+    scraper = BachtrackScraper(resolver=WorkResolver(min_observations=1))
+    scraper.search_operas(OperaQuery(freetext="Schicchi", city="Berlin"))
+    assert scraper.resolver.resolve("schicchi") is None
@@ -0,0 +1,75 @@
+"""Test freetext-to-work-ID resolution."""
+import sys
+import time
+from pathlib import Path
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+from scraper.resolver import WorkResolver
+from scraper.scraper import BachtrackScraper
+
+
+DETAIL_A = "https://bachtrack.com/opera-event/gianni-schicchi-deutsche-oper-berlin/428220"
+DETAIL_B = "https://bachtrack.com/opera-event/gianni-schicchi-winterthur/428221"
+
+
+def test_normalize():
+    """Spelling variants of the same search normalize to one key."""
+    assert WorkResolver.normalize("Gianni  Schicchi") == "gianni schicchi"
+    assert WorkResolver.normalize(" GIANNI schicchi\n") == "gianni schicchi"
+
+
+def test_learn_from_agreeing_work_links(tmp_path):
+    """A freetext search is mapped once several searches linked all listings to one work."""
+    path = tmp_path / "resolver.jsonl"
+    resolver = WorkResolver(str(path), min_observations=2)
+    resolver.learn("Gianni Schicchi", [(DETAIL_A, 12285), (DETAIL_B, 12285)])
+    assert resolver.resolve("gianni schicchi") is None
+
+    resolver.learn("gianni  schicchi", [(DETAIL_A, 12285)])
+    assert resolver.resolve("gianni  SCHICCHI") == 12285
+    assert resolver.resolve("12285") == 12285
+
+    # Mappings survive a restart
+    reloaded = WorkResolver(str(path))
+    assert reloaded.resolve("Gianni Schicchi") == 12285
+
+
+def test_work_searches_teach_nothing():
+    """Detail pages seen in a work search are not used to map later freetext searches."""
+    resolver = WorkResolver(min_observations=1)
+    resolver.learn(12285, [(DETAIL_A, None)])
+    resolver.learn("Il trittico", [(DETAIL_A, None)])
+    assert resolver.resolve("il trittico") is None
+
+
+def test_ambiguous_freetext_not_learned():
+    """Listings spanning several works, or without work links, reset the observations."""
+    resolver = WorkResolver(min_observations=2)
+    resolver.learn("puccini", [(DETAIL_A, 12285)])
+    resolver.learn("puccini", [(DETAIL_A, 12285), (DETAIL_B, 9999)])
+    resolver.learn("puccini", [(DETAIL_A, 12285)])
+    assert resolver.resolve("puccini") is None
+    resolver.learn("puccini", [(DETAIL_A, 12285), (DETAIL_B, None)])
+    resolver.learn("puccini", [(DETAIL_A, 12285)])
+    assert resolver.resolve("puccini") is None
+
+
+def test_mappings_expire(tmp_path):
+    """Expired mappings are neither used nor reloaded."""
+    path = tmp_path / "resolver.jsonl"
+    resolver = WorkResolver(str(path), min_observations=1, ttl=0.05)
+    resolver.learn("gianni schicchi", [(DETAIL_A, 12285)])
+    assert resolver.resolve("gianni schicchi") == 12285
+    time.sleep(0.1)
+    assert resolver.resolve("gianni schicchi") is None
+    assert WorkResolver(str(path)).resolve("gianni schicchi") is None
+
+
+def test_search_url_is_canonical():
+    """Resolved freetext searches share the work ID URL."""
+    scraper = BachtrackScraper(resolver=WorkResolver(min_observations=1))
+    scraper.resolver.learn("gianni schicchi", [(DETAIL_A, 12285)])
+    assert scraper.search_url("Gianni  Schicchi") == scraper.search_url(12285)
+    assert scraper.search_url("La  Traviata") == "https://bachtrack.com/search-opera/freetext=la%20traviata"
@@ -0,0 +1,123 @@
+"""Test cache snapshots and warm restarts."""
+import json
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+from fastapi.testclient import TestClient
+
+from backend.config import settings
+from backend import main
+from backend.main import create_app
+from backend.routes import events
+from scraper.scraper import BachtrackScraper
+from scraper.snapshot import SNAPSHOT_HEADER, load_snapshot, save_snapshot
+from tests.conftest import SCHICCHI_HTML
+
+
+WORK_URL = "https://bachtrack.com/search-opera/work=12285"
+
+
+def test_snapshot_round_trip(upstream, tmp_path):
+    """A restarted scraper serves snapshotted results without refetching, with the same expiry."""
+    upstream[WORK_URL] = SCHICCHI_HTML
+    path = str(tmp_path / "cache.snap")
+    scraper = BachtrackScraper()
+    events_before = scraper.search_operas(12285)
+    scraper.venue_cache.set("berlin|deutsche oper", "Bismarckstrasse 35", ttl=-1)
+    assert save_snapshot(scraper, path)["search_cache"] == 1
+
+    restarted = BachtrackScraper()
+    loaded = load_snapshot(restarted, path)
+    assert loaded == {"search_cache": 1, "detail_cache": 0, "missing_details": 0, "venue_cache": 0}
+    assert restarted.search_operas(12285) == events_before
+    assert abs(restarted.search_cache.remaining(WORK_URL) - scraper.search_cache.remaining(WORK_URL)) < 1
+    assert upstream.calls == [WORK_URL]
+
+
+def test_expired_entries_refresh(upstream, tmp_path):
+    """Entries that expired while the process was down are fetched again."""
+    upstream[WORK_URL] = SCHICCHI_HTML
+    path = str(tmp_path / "cache.snap")
+    scraper = BachtrackScraper(search_cache_ttl=0.05)
+    scraper.search_operas(12285)
+    save_snapshot(scraper, path)
+    time.sleep(0.1)
+
+    restarted = BachtrackScraper()
+    assert load_snapshot(restarted, path)["search_cache"] == 0
+    restarted.search_operas(12285)
+    assert len(upstream.calls) == 2
+
+
+def test_lifespan_warms_and_saves(upstream, tmp_path, monkeypatch):
+    """The app loads the snapshot on startup and writes it on shutdown."""
+    path = tmp_path / "cache.snap"
+    monkeypatch.setattr(settings, "snapshot_path", str(path))
+    events.service.scraper.search_cache.clear()
+    upstream[WORK_URL] = SCHICCHI_HTML
+
+    with TestClient(create_app()) as client:
+        client.get("/api/v1/events/search?work_id=12285")
+    assert path.exists()
+
+    events.service.scraper.search_cache.clear()
+    with TestClient(create_app()) as client:
+        assert events.service.is_cached(12285)
+    assert upstream.calls == [WORK_URL]
+
+
+def test_concurrent_saves_never_share_a_temp_file(tmp_path):
+    """Processes saving at once write separate temporary files and leave a valid snapshot."""
+    path = str(tmp_path / "cache.snap")
+    scraper = BachtrackScraper()
+    scraper.search_cache.set(WORK_URL, [{"title": "Gianni Schicchi"}])
+    threads = [threading.Thread(target=save_snapshot, args=(scraper, path)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert load_snapshot(BachtrackScraper(), path)["search_cache"] == 1
+    assert [p.name for p in tmp_path.iterdir()] == ["cache.snap"]
+
+
+def test_periodic_snapshot_survives_write_errors(tmp_path, monkeypatch, caplog):
+    """A failed periodic save is logged and the next one still runs."""
+    path = tmp_path / "cache.snap"
+    monkeypatch.setattr(settings, "snapshot_path", str(path))
+    monkeypatch.setattr(settings, "snapshot_interval", 0.05)
+    attempts = []
+
+    def flaky_save(scraper, snapshot_path):
+        attempts.append(snapshot_path)
+        if len(attempts) == 1:
+            raise OSError("disk full")
+        return save_snapshot(scraper, snapshot_path)
+
+    monkeypatch.setattr(main, "save_snapshot", flaky_save)
+    with TestClient(create_app()):
+        time.sleep(0.3)
+    assert len(attempts) >= 3
+    assert "disk full" in caplog.text
+    assert path.exists()
+
+
+def test_malformed_snapshot_is_logged_and_skipped(tmp_path, caplog):
+    """A snapshot of the right version but the wrong shape loads nothing instead of raising."""
+    path = tmp_path / "cache.snap"
+    payload = json.dumps({"search_cache": [["k", []]]}).encode("utf-8")
+    path.write_bytes(SNAPSHOT_HEADER + zlib.compress(payload))
+
+    scraper = BachtrackScraper()
+    assert load_snapshot(scraper, str(path)) == {}
+    assert len(scraper.search_cache) == 0
+    assert "Loading the cache snapshot" in caplog.text
+
+    path.write_bytes(b"BTSNAP1\n" + zlib.compress(b"not a pickle"))
+    assert load_snapshot(scraper, str(path)) == {}
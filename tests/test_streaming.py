@@ -0,0 +1,78 @@
+"""Test incremental parsing of search pages while they download."""
+import sys
+from pathlib import Path
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+import pytest
+import requests
+
+from scraper.scraper import BachtrackScraper
+from scraper.streaming import ListingStreamParser
+from tests.conftest import FakeResponse, SCHICCHI_HTML, listing_html
+
+
+def test_listings_emitted_as_they_close():
+    """A listing is emitted as soon as its closing tag has been fed."""
+    parser = ListingStreamParser()
+    parser.feed('<ul><li class="ad">skip</li><li data-type="nothing"><div>Tosca &amp; ')
+    assert parser.pop_listings() == []
+    parser.feed('more</div></li><li data-type="nothing">')
+    assert parser.pop_listings() == ['<li data-type="nothing"><div>Tosca &amp; more</div></li>']
+
+
+def test_incremental_matches_full_parse(upstream):
+    """Events from a page streamed in tiny chunks equal the whole-page parse."""
+    upstream["https://bachtrack.com/search-opera/work=12285"] = SCHICCHI_HTML
+    expected = BachtrackScraper().expand_listings(BachtrackScraper().parse_search_page(SCHICCHI_HTML))
+
+    scraper = BachtrackScraper()
+    events = scraper.iter_search(12285, chunk_size=7)
+    assert next(events) == expected[0]
+    assert [expected[0]] + list(events) == expected
+
+    # The completed stream is cached
+    assert scraper.search_operas(12285) == expected
+    assert len(upstream.calls) == 1
+
+
+def test_incremental_defaults_to_utf8(monkeypatch):
+    """Without a charset in Content-Type the page is decoded as UTF-8, not requests' ISO-8859-1."""
+    page = listing_html(("Carmen", "Genève", "Opéra des Nations", "Apr 05", "/opera-event/carmen/1"))
+    response = FakeResponse(page, headers={"Content-Type": "text/html"}, encoding="ISO-8859-1")
+    monkeypatch.setattr(requests.Session, "get", lambda session, url, **kwargs: response)
+
+    [event] = BachtrackScraper().iter_search(1, chunk_size=5)
+    assert (event["city"], event["venue"]) == ("Genève", "Opéra des Nations")
+
+
+UNCLOSED_PAGES = [
+    # Listings without </li>, ended by the next listing and by their list closing
+    SCHICCHI_HTML.replace(b"</li>", b""),
+    # Listings inside a <div> rather than a list, the last one ended by the </div>
+    SCHICCHI_HTML.replace(b"<ul>", b"<div>").replace(b"</ul>", b"</div><p>footer</p>").replace(b"</li>", b"", 1),
+    # A nested list whose <li> is left unclosed
+    SCHICCHI_HTML.replace(b'<div class="listing-ms-city">', b'<ul class="tags"><li>new<li>sold out</ul><div class="listing-ms-city">'),
+    # The last listing is still open when the page ends
+    SCHICCHI_HTML.replace(b"</li></ul></body></html>", b""),
+]
+
+
+@pytest.mark.parametrize("page", UNCLOSED_PAGES)
+def test_incremental_handles_omitted_end_tags(upstream, page):
+    """Listings whose </li> is omitted are cut out like the whole-page parse finds them."""
+    upstream["https://bachtrack.com/search-opera/work=12285"] = page
+    expected = BachtrackScraper().expand_listings(BachtrackScraper().parse_search_page(page))
+    assert len(expected) == 3
+
+    assert list(BachtrackScraper().iter_search(12285, chunk_size=11)) == expected
+
+
+def test_unclosed_listing_does_not_buffer_the_page():
+    """A listing is cut off when its list closes, so later markup is not buffered."""
+    parser = ListingStreamParser()
+    parser.feed('<ul><li data-type="nothing"><ul><li>a<li>b</ul><div>A</div></ul>')
+    parser.feed('<div>' + 'x' * 1000 + '</div>')
+    assert parser.pop_listings() == ['<li data-type="nothing"><ul><li>a<li>b</ul><div>A</div>']
+    assert parser._buffer == []
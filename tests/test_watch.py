@@ -0,0 +1,83 @@
+"""Test pushing changes to subscribers of a watched query."""
+import asyncio
+import sys
+from pathlib import Path
+
+# Ensure imports resolve to the `bachtrackapi` package directory.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bachtrackapi"))
+
+import pytest
+
+from backend.services.opera_service import OperaEventService
+from backend.services.watch import WatchHub, WatchLimitError
+from tests.conftest import SCHICCHI_HTML, listing_html
+
+
+WORK_URL = "https://bachtrack.com/search-opera/work=12285"
+
+
+def test_subscribers_share_one_refresh(upstream):
+    """Two subscribers of one query cost one upstream fetch per refresh and both get the change."""
+    upstream[WORK_URL] = SCHICCHI_HTML
+    service = OperaEventService()
+
+    async def scenario():
+        hub = WatchHub(service, refresh_interval=0.05, max_subscribers=2)
+        first = hub.subscribe(12285)
+        second = hub.subscribe("12285")
+        with pytest.raises(WatchLimitError):
+            hub.subscribe(12285)
+
+        await asyncio.sleep(0.1)
+        assert upstream.calls == [WORK_URL]
+
+        upstream[WORK_URL] = listing_html(
+            ("Gianni Schicchi", "Vienna", "Staatsoper", "Jun 01", "/opera-event/gianni-schicchi-vienna/7"),
+        )
+        service.scraper.search_cache.clear()
+        received = {}
+        for subscription in (first, second):
+            received[subscription] = [await asyncio.wait_for(subscription.queue.get(), timeout=1) for _ in range(4)]
+        assert received[first] == received[second]
+        assert sorted(change["change"] for change in received[first]) == ["added", "removed", "removed", "removed"]
+        assert upstream.calls == [WORK_URL, WORK_URL]
+
+        hub.unsubscribe(first)
+        hub.unsubscribe(second)
+        assert hub._watches == {}
+
+    asyncio.run(scenario())
+
+
+def test_refresher_survives_unexpected_errors(upstream, caplog):
+    """An unexpected error in one refresh is logged and later changes still arrive."""
+    upstream[WORK_URL] = SCHICCHI_HTML
+    service = OperaEventService()
+    search_operas = service.search_operas
+    failures = []
+
+    def flaky_search(search_input):
+        if len(failures) < 2:
+            failures.append(search_input)
+            raise ValueError("validation failed")
+        return search_operas(search_input)
+
+    service.search_operas = flaky_search
+
+    async def scenario():
+        hub = WatchHub(service, refresh_interval=0.02)
+        subscription = hub.subscribe(12285)
+        search_operas(12285)
+        await asyncio.sleep(0.1)
+
+        upstream[WORK_URL] = listing_html(
+            ("Gianni Schicchi", "Vienna", "Staatsoper", "Jun 01", "/opera-event/gianni-schicchi-vienna/7"),
+        )
+        service.scraper.search_cache.clear()
+        change = await asyncio.wait_for(subscription.queue.get(), timeout=1)
+        assert change["change"] in ("added", "removed")
+        hub.unsubscribe(subscription)
+
+    asyncio.run(scenario())
+    assert len(failures) == 2
+    assert "validation failed" in caplog.text